@@ -0,0 +1,5 @@
+"""Benchmarks for the desktop clients' data paths.
+
+Run ``python -m benchmarks.run`` from the repository root; see
+``python -m benchmarks.run --help`` for row counts and output options.
+"""
@@ -0,0 +1,406 @@
+"""Time the clients' data paths on synthetic payloads and write the results as JSON.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run --rows 10000 100000 1000000 --output bench.json
+    python -m benchmarks.run --rows 10000 --compare bench.json
+
+Core timings use the Tk client module (``main.py``) without a window. The
+Tk statistics frame is timed only when a display is available, and the Qt
+statistics page only when PySide6 is installed (offscreen).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, time as dtime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+from .server import StandInServer
+from .synthetic import SyntheticConfig, generate_errors, generate_history
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import main as client  # noqa: E402 - needs the repository root on sys.path
+
+BENCH_TOKEN = "benchmark-token"
+
+
+class Recorder:
+    """Collects timings and skipped groups for one run."""
+
+    def __init__(self, repeat: int) -> None:
+        self.repeat = repeat
+        self.results: List[Dict[str, Any]] = []
+        self.skipped: List[Dict[str, str]] = []
+
+    def measure(
+        self,
+        name: str,
+        rows: int,
+        fn: Callable[[], Any],
+        *,
+        setup: Optional[Callable[[], None]] = None,
+        teardown: Optional[Callable[[], None]] = None,
+        repeat: Optional[int] = None,
+        operations: Optional[int] = None,
+    ) -> Any:
+        timings: List[float] = []
+        result: Any = None
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - started)
+            if teardown is not None:
+                teardown()
+        entry: Dict[str, Any] = {
+            "name": name,
+            "rows": rows,
+            "median_s": statistics.median(timings),
+            "best_s": min(timings),
+            "runs": len(timings),
+        }
+        if operations:
+            entry["per_op_us"] = entry["median_s"] / operations * 1e6
+        self.results.append(entry)
+        print(f"  {name:<44} {entry['median_s'] * 1000:>10.1f} ms")
+        return result
+
+    def skip(self, group: str, reason: str) -> None:
+        if not any(item["group"] == group for item in self.skipped):
+            self.skipped.append({"group": group, "reason": reason})
+            print(f"  [skipped] {group}: {reason}")
+
+
+def wait_for_index(index: Any, timeout: float = 600.0) -> None:
+    deadline = time.monotonic() + timeout
+    while index.candidates(0, "000") is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def period_bounds(records: List[Any]) -> tuple:
+    """Last 30 days of the data set, cut at odd hours so boundary days are partial."""
+
+    newest = next((record.local for record in records if record.local), None)
+    if newest is None:
+        return None, None
+    return newest - timedelta(days=30, hours=5), newest - timedelta(hours=3)
+
+
+def bench_core(rec: Recorder, rows: int, history: List[Dict[str, Any]], errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    stamps = [item["datetime"] for item in history]
+    rec.measure("parse_api_datetime", rows, lambda: [client.parse_api_datetime(value) for value in stamps])
+    records = rec.measure("TrackingRecord", rows, lambda: [client.TrackingRecord(item) for item in history])
+    ordered = rec.measure(
+        "sort by sort_key",
+        rows,
+        lambda: sorted(records, key=lambda record: record.sort_key, reverse=True),
+    )
+    rec.measure("TimedRecords (keys + rollup)", rows, lambda: client.TimedRecords(ordered))
+
+    cache = client.RecordCache("/get_history")
+    rec.measure(
+        "RecordCache full sync (_apply)",
+        rows,
+        lambda: cache._apply(history, False),
+        setup=cache.reset,
+        teardown=cache.index.clear,
+    )
+    cache.reset()
+    cache._apply(history, False)
+    wait_for_index(cache.index)
+    timed = cache._records
+
+    sample = next((record for record in timed if record.day), timed[0])
+    filters = {
+        "box": client.RecordFilter.from_inputs(sample.get("boxid")[2:6], "", "", None, None, None),
+        "user": client.RecordFilter.from_inputs("", "", sample.user, None, None, None),
+        "day": client.RecordFilter.from_inputs("", "", "", sample.day, None, None),
+        "day+hours": client.RecordFilter.from_inputs(
+            "", "", "", sample.day, dtime(hour=9), dtime(hour=18)
+        ),
+    }
+    for label, criteria in filters.items():
+        rec.measure(
+            f"apply_filters {label} (scan)",
+            rows,
+            lambda criteria=criteria: client.RecordSearch().begin(timed, criteria).run(),
+        )
+        rec.measure(
+            f"apply_filters {label} (index)",
+            rows,
+            lambda criteria=criteria: client.RecordSearch(cache.index).begin(timed, criteria).run(),
+        )
+    cache.reset()
+
+    errors_timed = client.TimedRecords(
+        sorted((client.TrackingRecord(item) for item in errors), key=lambda r: r.sort_key, reverse=True)
+    )
+    start, end = period_bounds(timed)
+
+    def aggregate() -> tuple:
+        scan_days = timed.day_counts(start, end)
+        error_days = errors_timed.day_counts(start, end)
+        return scan_days, error_days, client.DayRollup.totals(scan_days.values()), client.DayRollup.totals(error_days.values())
+
+    rec.measure("statistics aggregate (30 days)", rows, aggregate)
+    rec.measure(
+        "statistics aggregate (all data)",
+        rows,
+        lambda: (timed.day_counts(None, None), errors_timed.day_counts(None, None)),
+    )
+    return {"history": timed, "errors": errors_timed, "start": start, "end": end}
+
+
+def bench_queue(rec: Recorder, server: StandInServer, history: List[Dict[str, Any]], queue_rows: int) -> None:
+    records = [
+        {key: item[key] for key in ("boxid", "ttn", "user_name", "datetime")}
+        for item in history[:queue_rows]
+    ]
+    saved = {
+        name: getattr(client, name)
+        for name in ("API_BASE", "OFFLINE_QUEUE_BACKEND", "QUEUE_PATH", "QUEUE_JOURNAL_PATH", "QUEUE_DB_PATH")
+    }
+    try:
+        client.API_BASE = server.base_url
+        for backend in ("journal", "sqlite"):
+            with tempfile.TemporaryDirectory() as tmp:
+                folder = Path(tmp)
+                client.OFFLINE_QUEUE_BACKEND = backend
+                client.QUEUE_PATH = folder / "offline_queue.json"
+                client.QUEUE_JOURNAL_PATH = folder / "offline_queue.journal"
+                client.QUEUE_DB_PATH = folder / "offline_queue.sqlite3"
+                client.OfflineQueue._store = None
+                rec.measure(
+                    f"OfflineQueue.add_record [{backend}]",
+                    len(records),
+                    lambda: [client.OfflineQueue.add_record(record) for record in records],
+                    repeat=1,
+                    operations=len(records),
+                )
+                # sync_pending hands this pass to the sync worker; time it directly.
+                rec.measure(
+                    f"OfflineQueue drain (sync_pending) [{backend}]",
+                    len(records),
+                    lambda: client.OfflineQueue.drain(BENCH_TOKEN),
+                    repeat=1,
+                    operations=len(records),
+                )
+                client.OfflineQueue._store = None
+    finally:
+        for name, value in saved.items():
+            setattr(client, name, value)
+        client.OfflineQueue._store = None
+
+
+def bench_http(rec: Recorder, rows: int, server: StandInServer) -> None:
+    saved = client.API_BASE
+    cache = client.RecordCache("/get_history")
+    try:
+        client.API_BASE = server.base_url
+        rec.measure(
+            "RecordCache.sync over HTTP",
+            rows,
+            lambda: cache.sync(BENCH_TOKEN),
+            setup=cache.reset,
+            teardown=cache.index.clear,
+        )
+    finally:
+        client.API_BASE = saved
+        cache.reset()
+
+
+def bench_tk(rec: Recorder, rows: int, data: Dict[str, Any]) -> None:
+    import tkinter as tk
+    from tkinter import ttk
+
+    class BenchApp(tk.Tk):
+        """Hidden root carrying what the statistics frame reads from TrackingApp."""
+
+        _setup_styles = client.TrackingApp._setup_styles
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.withdraw()
+            self.state_data = client.AppState(user_role="admin")
+            self.is_online = True
+            self.style = ttk.Style(self)
+            self._setup_styles()
+
+        def show_scanner(self) -> None:
+            pass
+
+        show_history = show_errors = show_statistics = show_scanner
+
+    try:
+        app = BenchApp()
+    except tk.TclError as exc:
+        rec.skip("tk", f"no display ({exc})")
+        return
+    try:
+        frame = client.StatisticsFrame(app)
+        frame.history_records = data["history"]
+        frame.error_records = data["errors"]
+        rec.measure("Tk refresh_statistics", rows, frame.refresh_statistics)
+        with tempfile.TemporaryDirectory() as tmp:
+            target = str(Path(tmp) / "report.csv")
+            with mock.patch.object(client.filedialog, "asksaveasfilename", return_value=target), \
+                    mock.patch.object(client.messagebox, "showinfo"):
+                rec.measure("Tk export_statistics (CSV)", rows, frame.export_statistics)
+    finally:
+        app.destroy()
+
+
+def bench_qt(rec: Recorder, rows: int, data: Dict[str, Any], qt_state: Dict[str, Any]) -> None:
+    try:
+        import PySide6  # noqa: F401 - availability check
+    except ImportError:
+        rec.skip("qt", "PySide6 is not installed")
+        return
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import tracking_app_windows as qt_client
+
+    if "app" not in qt_state:
+        qt_state["app"] = qt_client.QApplication.instance() or qt_client.QApplication([])
+        qt_state["controller"] = qt_client.TrackingAppController(qt_client.AppState())
+    # The Qt client has its own copies of the record classes.
+    history = qt_client.TimedRecords(
+        sorted((qt_client.TrackingRecord(r.data) for r in data["history"]), key=lambda r: r.sort_key, reverse=True)
+    )
+    errors = qt_client.TimedRecords(
+        sorted((qt_client.TrackingRecord(r.data) for r in data["errors"]), key=lambda r: r.sort_key, reverse=True)
+    )
+    page = qt_client.StatisticsPage(qt_state["controller"])
+    page.history_records = history
+    page.error_records = errors
+    start, end = data["start"], data["end"]
+    if start is not None:
+        page.start_date, page.start_time = start.date(), start.time()
+        page.end_date, page.end_time = end.date(), end.time()
+    rec.measure("Qt StatisticsPage._refresh", rows, page._refresh)
+    scan_days = history.day_counts(None, None)
+    error_days = errors.day_counts(None, None)
+    rec.measure(
+        "Qt _populate_timeline (all days)", rows, lambda: page._populate_timeline(scan_days, error_days)
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        rec.measure(
+            "Qt export_statistics (CSV)",
+            rows,
+            lambda: qt_state["controller"].export_statistics(
+                file_path=str(Path(tmp) / "report.csv"),
+                period_text=page.period_label.text(),
+                updated_text="—",
+                totals={},
+                scan_counts=page.scan_counts,
+                error_counts=page.error_counts,
+                daily_rows=page.daily_rows,
+            ),
+        )
+    page.deleteLater()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: Dict[str, Any], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    before = {(item["name"], item["rows"]): item["median_s"] for item in baseline.get("results", [])}
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit') or '?'}):")
+    for item in report["results"]:
+        old = before.get((item["name"], item["rows"]))
+        if old:
+            print(f"  {item['name']:<44} {item['rows']:>8}  x{item['median_s'] / old:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--users", type=int, default=25)
+    parser.add_argument("--days", type=int, default=90, help="date span of the generated rows")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--error-ratio", type=float, default=0.1, help="error rows per history row")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--queue-rows",
+        type=int,
+        default=2_000,
+        help="records per offline-queue run (every journal append is fsynced)",
+    )
+    parser.add_argument("--http", action="store_true", help="also time RecordCache.sync against the stand-in server")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    rec = Recorder(args.repeat)
+    qt_state: Dict[str, Any] = {}
+    for rows in args.rows:
+        config = SyntheticConfig(
+            rows=rows, users=args.users, days=args.days, duplicate_rate=args.duplicate_rate, seed=args.seed
+        )
+        error_config = SyntheticConfig(
+            rows=max(1, int(rows * args.error_ratio)),
+            users=args.users,
+            days=args.days,
+            duplicate_rate=args.duplicate_rate,
+            seed=args.seed,
+        )
+        print(f"{rows} rows")
+        history = generate_history(config)
+        errors = generate_errors(error_config)
+        data = bench_core(rec, rows, history, errors)
+        if args.http:
+            with StandInServer(history, errors) as server:
+                bench_http(rec, rows, server)
+        bench_tk(rec, rows, data)
+        bench_qt(rec, rows, data, qt_state)
+        del history, errors, data
+    if args.queue_rows:
+        print(f"offline queue, {args.queue_rows} records")
+        queue_config = SyntheticConfig(rows=args.queue_rows, users=args.users, days=args.days, seed=args.seed)
+        with StandInServer() as server:
+            bench_queue(rec, server, generate_history(queue_config), args.queue_rows)
+
+    report = {
+        "commit": git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "results": rec.results,
+        "skipped": rec.skipped,
+    }
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+    return report
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
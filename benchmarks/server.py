@@ -0,0 +1,209 @@
+"""Local stand-in for the tracking API used by the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+
+class StandInServer:
+    """Serves fixed ``/get_history``/``/get_errors`` payloads and accepts uploads.
+
+    ``/add_record`` and ``/add_records_batch`` answer like the real API, so
+    offline-queue drains can be timed and tested without the network. An
+    idempotency key seen before is answered with a duplicate note instead of
+    a second insert. ``batch_endpoint=False`` makes the batch route answer
+    404 like an older server, records whose BoxID is in ``reject_boxids``
+    get a 422, and ``fail_next`` makes that many upload requests answer
+    ``fail_status`` (503 unless changed).
+    Every request is logged in :attr:`calls` as ``(path, keys)``; GET paths
+    keep their query string. Lists ignore ``since_id`` like an older server
+    unless ``since_id`` is ``"inclusive"`` (rows with ``id >= since_id``) or
+    ``"exclusive"`` (``id > since_id``); :meth:`set_records` replaces a list.
+    ``validators`` names the cache validators lists carry (``"etag"``,
+    ``"last-modified"``); a matching conditional GET is answered 304 and
+    counted in :attr:`not_modified`.
+    Use as a context manager; :attr:`base_url` is the value to put in the
+    client's ``API_BASE``.
+    """
+
+    DUPLICATE_NOTE = "Дублікат"
+
+    def __init__(
+        self,
+        history: Optional[List[Dict[str, Any]]] = None,
+        errors: Optional[List[Dict[str, Any]]] = None,
+        *,
+        batch_endpoint: bool = True,
+        reject_boxids: Iterable[str] = (),
+        since_id: Optional[str] = None,
+        validators: Iterable[str] = (),
+    ) -> None:
+        self.lists: Dict[str, List[Dict[str, Any]]] = {}
+        self.bodies: Dict[str, bytes] = {}
+        self._versions: Dict[str, int] = {}
+        self.set_records("/get_history", history or [])
+        self.set_records("/get_errors", errors or [])
+        self.since_id = since_id
+        self.validators = set(validators)
+        self.not_modified = 0
+        self.batch_endpoint = batch_endpoint
+        self.reject_boxids = set(reject_boxids)
+        self.fail_next = 0
+        self.fail_status = 503
+        self.uploaded = 0
+        self.calls: List[Tuple[str, List[str]]] = []
+        self._stored: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def set_records(self, path: str, records: List[Dict[str, Any]]) -> None:
+        self.lists[path] = records
+        self.bodies[path] = json.dumps(records, ensure_ascii=False).encode("utf-8")
+        self._versions[path] = sum(self._versions.values()) + 1
+
+    def _validator_headers(self, path: str, query: str) -> Dict[str, str]:
+        version = self._versions[path]
+        headers = {}
+        if "etag" in self.validators:
+            headers["ETag"] = f'"{version}-{query}"'
+        if "last-modified" in self.validators:
+            # One second per change keeps If-Modified-Since exact.
+            headers["Last-Modified"] = formatdate(1_700_000_000 + version, usegmt=True)
+        return headers
+
+    def _is_fresh(self, request_headers: Any, headers: Dict[str, str]) -> bool:
+        if request_headers.get("If-None-Match") is not None:
+            return request_headers["If-None-Match"] == headers.get("ETag")
+        since = request_headers.get("If-Modified-Since")
+        if since is None or "Last-Modified" not in headers:
+            return False
+        try:
+            return parsedate_to_datetime(since) >= parsedate_to_datetime(headers["Last-Modified"])
+        except (TypeError, ValueError):
+            return False
+
+    def _list_body(self, path: str, query: str) -> Optional[bytes]:
+        body = self.bodies.get(path)
+        since = parse_qs(query).get("since_id")
+        if body is None or not since or self.since_id is None:
+            return body
+        bound = int(since[0])
+        inclusive = self.since_id == "inclusive"
+        records = [
+            item
+            for item in self.lists[path]
+            if item.get("id") is not None and (item["id"] >= bound if inclusive else item["id"] > bound)
+        ]
+        return json.dumps(records, ensure_ascii=False).encode("utf-8")
+
+    @property
+    def stored(self) -> Dict[str, Dict[str, Any]]:
+        """Accepted records by idempotency key."""
+
+        with self._lock:
+            return dict(self._stored)
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server is not running"
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _log(self, path: str, keys: List[str], *, fallible: bool = True) -> bool:
+        """Log a request; ``False`` when it should fail with :attr:`fail_status`."""
+
+        with self._lock:
+            self.calls.append((path, keys))
+            if fallible and self.fail_next > 0:
+                self.fail_next -= 1
+                return False
+            return True
+
+    def _accept(self, key: str, record: Dict[str, Any]) -> Tuple[int, str]:
+        if record.get("boxid") in self.reject_boxids:
+            return 422, ""
+        with self._lock:
+            if key in self._stored:
+                return 200, self.DUPLICATE_NOTE
+            self._stored[key] = record
+            self.uploaded += 1
+        return 200, ""
+
+    def __enter__(self) -> "StandInServer":
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def do_HEAD(self) -> None:  # noqa: N802 - http.server naming
+                self._send(200)
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                stand_in._log(self.path, [], fallible=False)
+                path, _, query = self.path.partition("?")
+                body = stand_in._list_body(path, query)
+                if body is None:
+                    self._send(404, b'{"detail": "Not Found"}')
+                    return
+                headers = stand_in._validator_headers(path, query)
+                if headers and stand_in._is_fresh(self.headers, headers):
+                    with stand_in._lock:
+                        stand_in.not_modified += 1
+                    self._send(304, headers=headers)
+                else:
+                    self._send(200, body, headers)
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/add_records_batch" and stand_in.batch_endpoint:
+                    records = [item for item in payload.get("records", []) if isinstance(item, dict)]
+                    keys = [str(item.get("idempotency_key") or "") for item in records]
+                    if not stand_in._log(self.path, keys):
+                        self._send(stand_in.fail_status)
+                        return
+                    results = []
+                    for key, item in zip(keys, records):
+                        record = {name: value for name, value in item.items() if name != "idempotency_key"}
+                        status, note = stand_in._accept(key, record)
+                        results.append({"idempotency_key": key, "status": status, "note": note})
+                    self._send(200, json.dumps({"results": results}, ensure_ascii=False).encode("utf-8"))
+                elif self.path == "/add_record":
+                    key = self.headers.get("Idempotency-Key") or ""
+                    if not stand_in._log(self.path, [key]):
+                        self._send(stand_in.fail_status)
+                        return
+                    status, note = stand_in._accept(key, payload)
+                    body = json.dumps({"note": note}, ensure_ascii=False).encode("utf-8")
+                    self._send(status, body if status == 200 else b'{"detail": "Unprocessable"}')
+                else:
+                    stand_in._log(self.path, [], fallible=False)
+                    self._send(404, b'{"detail": "Not Found"}')
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - base signature
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="stand-in-api", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
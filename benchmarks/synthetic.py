@@ -0,0 +1,91 @@
+"""Synthetic ``/get_history`` and ``/get_errors`` payloads."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+ERROR_MESSAGES = (
+    "Невірний формат ТТН",
+    "ТТН вже прив'язана до іншого BoxID",
+    "BoxID не знайдено",
+    "Повторне сканування",
+)
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """Shape of a generated payload.
+
+    ``duplicate_rate`` is the share of rows that rescan an earlier BoxID/TTN
+    pair (the server marks those with a duplicate note). Timestamps are
+    spread over the ``days`` before ``end``; ``undated_rate`` rows carry no
+    usable datetime.
+    """
+
+    rows: int = 10_000
+    users: int = 25
+    days: int = 90
+    duplicate_rate: float = 0.05
+    undated_rate: float = 0.001
+    seed: int = 1
+    end: datetime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _user_names(count: int) -> List[str]:
+    surnames = ("Коваленко", "Шевченко", "Бондаренко", "Ткаченко", "Мельник", "Кравченко", "Олійник")
+    return [f"{surnames[i % len(surnames)]} {i // len(surnames) + 1}" for i in range(count)]
+
+
+def _rows(config: SyntheticConfig, first_id: int) -> List[Dict[str, Any]]:
+    rng = random.Random(config.seed + first_id)
+    users = _user_names(max(1, config.users))
+    span = max(1, config.days) * 24 * 60 * 60
+    start = config.end - timedelta(seconds=span)
+    seen: List[Tuple[str, str]] = []
+    rows: List[Dict[str, Any]] = []
+    for offset in range(config.rows):
+        if seen and rng.random() < config.duplicate_rate:
+            boxid, ttn = seen[rng.randrange(len(seen))]
+            note = "Дублікат"
+        else:
+            boxid = f"{rng.randrange(10**9):09d}"
+            ttn = f"20{rng.randrange(10**12):012d}"
+            note = ""
+            if len(seen) < 100_000:
+                seen.append((boxid, ttn))
+        if rng.random() < config.undated_rate:
+            moment = ""
+        else:
+            stamp = start + timedelta(seconds=rng.randrange(span))
+            moment = stamp.replace(tzinfo=None).isoformat(timespec="microseconds")
+        rows.append(
+            {
+                "id": first_id + offset,
+                "boxid": boxid,
+                "ttn": ttn,
+                "user_name": rng.choice(users),
+                "datetime": moment,
+                "note": note,
+            }
+        )
+    return rows
+
+
+def generate_history(config: SyntheticConfig) -> List[Dict[str, Any]]:
+    """Rows as ``/get_history`` returns them (ids ascending, times unordered)."""
+
+    return _rows(config, first_id=1)
+
+
+def generate_errors(config: SyntheticConfig) -> List[Dict[str, Any]]:
+    """Rows as ``/get_errors`` returns them, each with an ``error_message``."""
+
+    rng = random.Random(config.seed)
+    rows = _rows(config, first_id=10**9)
+    for row in rows:
+        row["error_message"] = rng.choice(ERROR_MESSAGES)
+        row.pop("note")
+    return rows
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402 - needs the repository root on sys.path
+
+
+@pytest.fixture
+def queue_paths(tmp_path, monkeypatch):
+    """Point the offline queue at ``tmp_path`` and reset its cached store."""
+
+    monkeypatch.setattr(main, "QUEUE_PATH", tmp_path / "offline_queue.json")
+    monkeypatch.setattr(main, "QUEUE_JOURNAL_PATH", tmp_path / "offline_queue.journal")
+    monkeypatch.setattr(main, "QUEUE_DB_PATH", tmp_path / "offline_queue.sqlite3")
+    monkeypatch.setattr(main.OfflineQueue, "_store", None)
+    yield tmp_path
+    main.OfflineQueue._store = None
@@ -0,0 +1,38 @@
+import pytest
+import requests
+
+import main
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monitor = main.ConnectivityMonitor()
+    monkeypatch.setattr(main, "CONNECTIVITY", monitor)
+    return monitor
+
+
+@pytest.mark.parametrize(
+    "error",
+    [requests.ConnectionError, requests.Timeout, requests.TooManyRedirects,
+     requests.exceptions.ChunkedEncodingError, requests.exceptions.InvalidURL],
+)
+def test_failed_request_reports_offline(monitor, monkeypatch, error):
+    def fail(*args, **kwargs):
+        raise error("boom")
+
+    monkeypatch.setattr(main.HttpTransport.session(), "request", fail)
+    with pytest.raises(error):
+        main.HttpTransport.get("http://127.0.0.1:9/get_history")
+    assert monitor.online is False
+
+
+def test_failed_probe_pushes_the_next_one_back(monitor, monkeypatch):
+    def fail(*args, **kwargs):
+        raise requests.exceptions.InvalidURL("bad")
+
+    monkeypatch.setattr(main.HttpTransport, "head", fail)
+    assert monitor._probe_delay() == 0.0
+
+    monitor._probe()
+    assert monitor.online is False
+    assert monitor._probe_delay() > 0
@@ -0,0 +1,143 @@
+import json
+
+import main
+from main import JournalQueueStore
+
+
+def make_store(tmp_path):
+    return JournalQueueStore(tmp_path / "queue.json", tmp_path / "queue.journal")
+
+
+def record(n):
+    return {"boxid": f"box{n}", "ttn": f"ttn{n}", "user_name": "Оператор"}
+
+
+def test_append_survives_reload(tmp_path):
+    store = make_store(tmp_path)
+    for n in range(3):
+        store.append(record(n), f"k{n}")
+    store.append(record(0), "k0")
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.count() == 3
+    assert reloaded.records() == [record(0), record(1), record(2)]
+
+
+def test_torn_last_line_is_skipped_and_repaired(tmp_path):
+    store = make_store(tmp_path)
+    store.append(record(1), "k1")
+    with store.journal_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"seq": 2, "key": "k2", "rec')
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.count() == 1
+    reloaded.append(record(3), "k3")
+
+    assert [entry.key for entry in make_store(tmp_path).claim(10)] == ["k1", "k3"]
+
+
+def test_legacy_list_is_migrated_with_keys(tmp_path):
+    (tmp_path / "queue.json").write_text(json.dumps([record(1), record(2)]), encoding="utf-8")
+
+    store = make_store(tmp_path)
+    batch = store.claim(10)
+
+    assert [entry.record for entry in batch] == [record(1), record(2)]
+    assert all(entry.key for entry in batch)
+    checkpoint = json.loads((tmp_path / "queue.json").read_text(encoding="utf-8"))
+    assert [item["key"] for item in checkpoint["entries"]] == [entry.key for entry in batch]
+
+
+def test_compaction_folds_journal_into_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "QUEUE_COMPACT_THRESHOLD", 4)
+    store = make_store(tmp_path)
+    for n in range(5):
+        store.append(record(n), f"k{n}")
+    store.mark_synced(["k0"])
+
+    assert store.journal_path.exists()
+    checkpoint = json.loads(store.checkpoint_path.read_text(encoding="utf-8"))
+    assert checkpoint["last_seq"] == 4
+    assert make_store(tmp_path).count() == 4
+
+
+def test_crash_between_checkpoint_and_journal_removal(tmp_path):
+    store = make_store(tmp_path)
+    for n in range(3):
+        store.append(record(n), f"k{n}")
+    journal = store.journal_path.read_text(encoding="utf-8")
+    store.mark_synced(["k1"])
+    store._compact_locked()
+    store.journal_path.write_text(journal, encoding="utf-8")
+
+    assert [entry.key for entry in make_store(tmp_path).claim(10)] == ["k0", "k2"]
+
+
+def test_synced_records_are_dropped_without_rewrite(tmp_path):
+    store = make_store(tmp_path)
+    for n in range(3):
+        store.append(record(n), f"k{n}")
+    store.mark_synced(["k1"])
+
+    assert not store.checkpoint_path.exists()
+    assert [entry.key for entry in make_store(tmp_path).claim(10)] == ["k0", "k2"]
+
+
+def test_emptied_queue_is_compacted(tmp_path):
+    store = make_store(tmp_path)
+    store.append(record(1), "k1")
+    store.mark_synced(["k1"])
+
+    assert not store.journal_path.exists()
+    assert make_store(tmp_path).count() == 0
+
+
+def test_retry_state_and_parking_persist(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "QUEUE_MAX_ATTEMPTS", 2)
+    store = make_store(tmp_path)
+    store.append(record(1), "k1")
+    store.append(record(2), "k2")
+    store.claim(10)
+    store.mark_failed(["k1"], "HTTP 422", permanent=True)
+    store.mark_failed(["k2"], "timeout")
+    store.mark_failed(["k1"], "HTTP 422", permanent=True)
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.count() == 1
+    assert reloaded.records() == [record(2)]
+    assert reloaded.claim(10) == []
+    assert reloaded._attempts == {"k1": 2, "k2": 1}
+    assert reloaded._parked == {"k1"}
+    assert reloaded.parked_count() == 1
+
+
+def test_parked_records_can_be_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "QUEUE_MAX_ATTEMPTS", 1)
+    store = make_store(tmp_path)
+    store.append(record(1), "k1")
+    store.append(record(2), "k2")
+    store.claim(10)
+    store.mark_failed(["k1"], "HTTP 422", permanent=True)
+    store.release(["k2"])
+
+    assert store.retry_parked() == 1
+    assert store.retry_parked() == 0
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.parked_count() == 0
+    assert reloaded._attempts == {}
+    assert [entry.key for entry in reloaded.claim(10)] == ["k1", "k2"]
+
+
+def test_claim_skips_in_flight_and_honours_cursor(tmp_path):
+    store = make_store(tmp_path)
+    for n in range(5):
+        store.append(record(n), f"k{n}")
+
+    first = store.claim(2)
+    second = store.claim(2, after=first[-1].entry_id)
+    store.release([entry.key for entry in first])
+
+    assert [entry.key for entry in first] == ["k0", "k1"]
+    assert [entry.key for entry in second] == ["k2", "k3"]
+    assert [entry.key for entry in store.claim(10)] == ["k0", "k1", "k4"]
@@ -0,0 +1,125 @@
+import pytest
+
+import main
+from benchmarks.server import StandInServer
+
+TOKEN = "test-token"
+
+
+def rows(*ids):
+    return [
+        {"id": n, "boxid": f"box{n}", "ttn": f"ttn{n}", "user_name": "Оператор",
+         "datetime": f"2026-01-01T10:{n:02d}:00"}
+        for n in ids
+    ]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StandInServer(rows(*range(1, 11))) as stand_in:
+        monkeypatch.setattr(main, "API_BASE", stand_in.base_url)
+        yield stand_in
+
+
+def serve_history(server, items):
+    server.set_records("/get_history", items)
+
+
+def ids(records):
+    return sorted(record.get("id") for record in records)
+
+
+def test_delta_sync_keeps_rows_until_the_next_full_sync(server, monkeypatch):
+    monkeypatch.setattr(main, "RECORD_FULL_SYNC_EVERY", 1)
+    cache = main.RecordCache("/get_history")
+    assert len(cache.sync(TOKEN)) == 10
+
+    serve_history(server, [])
+    assert len(cache.sync(TOKEN)) == 10
+    assert "since_id=10" in server.calls[-1][0]
+
+    assert len(cache.sync(TOKEN)) == 0
+    assert "since_id" not in server.calls[-1][0]
+
+
+def test_full_sync_after_interval(server, monkeypatch):
+    monkeypatch.setattr(main, "RECORD_FULL_SYNC_SECONDS", 0)
+    cache = main.RecordCache("/get_history")
+    cache.sync(TOKEN)
+
+    serve_history(server, rows(2, 4, 11))
+    assert ids(cache.sync(TOKEN)) == [2, 4, 11]
+    assert "since_id" not in server.calls[-1][0]
+
+
+def test_full_response_replaces_cached_rows(server):
+    cache = main.RecordCache("/get_history")
+    cache.sync(TOKEN)
+    cache._delta_syncs = main.RECORD_FULL_SYNC_EVERY
+
+    serve_history(server, rows(1, 5, 12))
+    records = cache.sync(TOKEN)
+
+    assert ids(records) == [1, 5, 12]
+    assert [record.get("id") for record in records] == [12, 5, 1]
+    assert sum(sum(users.values()) for users in records.rollup.days.values()) == 3
+
+
+@pytest.mark.parametrize("since_id", ["inclusive", "exclusive"])
+def test_delta_response_is_merged(monkeypatch, since_id):
+    with StandInServer(rows(*range(1, 11)), since_id=since_id) as stand_in:
+        monkeypatch.setattr(main, "API_BASE", stand_in.base_url)
+        cache = main.RecordCache("/get_history")
+        cache.sync(TOKEN)
+
+        serve_history(stand_in, rows(*range(1, 13)))
+        assert ids(cache.sync(TOKEN)) == list(range(1, 13))
+        assert "since_id=10" in stand_in.calls[-1][0]
+
+        serve_history(stand_in, rows(*range(2, 14)))
+        assert ids(cache.sync(TOKEN)) == list(range(1, 14))
+        assert cache._delta_syncs == 2
+
+
+def test_server_ignoring_since_id_is_treated_as_full(server):
+    cache = main.RecordCache("/get_history")
+    cache.sync(TOKEN)
+
+    serve_history(server, rows(3, 10, 11))
+    assert ids(cache.sync(TOKEN)) == [3, 10, 11]
+    assert "since_id=10" in server.calls[-1][0]
+
+
+@pytest.fixture(params=[("etag",), ("last-modified",)], ids=["etag", "last-modified"])
+def validating_server(request, monkeypatch):
+    monkeypatch.setattr(main, "RECORD_FULL_SYNC_SECONDS", 0)
+    with StandInServer(rows(*range(1, 11)), validators=request.param) as stand_in:
+        monkeypatch.setattr(main, "API_BASE", stand_in.base_url)
+        yield stand_in
+
+
+def test_not_modified_keeps_rows_without_parsing(validating_server, monkeypatch):
+    cache = main.RecordCache("/get_history")
+    records = cache.sync(TOKEN)
+
+    def unexpected(*args):
+        raise AssertionError("a 304 must not be parsed")
+
+    monkeypatch.setattr(cache, "_apply", unexpected)
+    monkeypatch.setattr(main, "TrackingRecord", unexpected)
+    assert cache.sync(TOKEN) is records
+    assert validating_server.not_modified == 1
+    assert ids(records) == list(range(1, 11))
+
+
+def test_changed_list_is_downloaded_again(validating_server):
+    cache = main.RecordCache("/get_history")
+    cache.sync(TOKEN)
+    cache.sync(TOKEN)
+
+    serve_history(validating_server, rows(*range(2, 12)))
+    assert ids(cache.sync(TOKEN)) == list(range(2, 12))
+    assert validating_server.not_modified == 1
+
+    assert ids(cache.sync(TOKEN)) == list(range(2, 12))
+    assert validating_server.not_modified == 2
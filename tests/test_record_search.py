@@ -0,0 +1,126 @@
+import pytest
+
+import main
+from benchmarks.synthetic import SyntheticConfig, generate_history
+
+
+def never():
+    return False
+
+
+def criteria(box="", ttn="", user=""):
+    return main.RecordFilter.from_inputs(box, ttn, user, None, None, None)
+
+
+@pytest.fixture(scope="module")
+def records():
+    items = generate_history(SyntheticConfig(rows=3_000, users=12, seed=11))
+    return main.TimedRecords(
+        sorted((main.TrackingRecord(item) for item in items), key=lambda r: r.sort_key, reverse=True)
+    )
+
+
+def test_superseded_pass_is_cancelled_and_not_committed(records):
+    search = main.RecordSearch()
+    stale = search.begin(records, criteria(box="1"))
+    latest = search.begin(records, criteria(box="2"))
+
+    assert stale.cancelled()
+    assert stale.run() is None
+    assert not stale.commit(stale.run())
+
+    result = latest.run()
+    assert latest.commit(result)
+    assert result == criteria(box="2").apply(records, never)
+
+
+def test_stale_result_finished_in_time_is_still_dropped(records):
+    search = main.RecordSearch()
+    stale = search.begin(records, criteria(box="12"))
+    result = stale.run()
+    latest = search.begin(records, criteria(box="3"))
+
+    assert not stale.commit(result)
+    assert latest.commit(latest.run())
+    assert search._criteria == criteria(box="3")
+
+
+def run(search, records, filters):
+    search_pass = search.begin(records, filters)
+    result = search_pass.run()
+    assert search_pass.commit(result)
+    return search_pass, result
+
+
+def same_rows(result, expected):
+    assert set(result) == set(expected)
+    assert [record.sort_key for record in result] == [record.sort_key for record in expected]
+
+
+def typed(text):
+    """Every prefix of ``text``, as a live search sees it while typing."""
+
+    return [text[:end] for end in range(1, len(text) + 1)]
+
+
+@pytest.fixture(scope="module")
+def index(records):
+    index = main.TrigramIndex()
+    index.add(records)
+    index._build()
+    return index
+
+
+@pytest.mark.parametrize("indexed", [False, True], ids=["scan", "index"])
+def test_typing_narrows_from_the_previous_result(records, index, indexed):
+    search = main.RecordSearch(index if indexed else None)
+    sample = records[len(records) // 2]
+    box, ttn, user = sample.search_keys
+    steps = [criteria(box=prefix) for prefix in typed(box[:6])]
+    steps += [criteria(box=box[:6], user=prefix) for prefix in typed(user[:5])]
+    steps += [criteria(box=box[:6], user=user[:5], ttn=ttn[-2:])]
+
+    for position, filters in enumerate(steps):
+        search_pass, result = run(search, records, filters)
+        if position:
+            assert search_pass.base is not records
+        same_rows(result, filters.apply(records, never))
+    assert sample in result
+
+
+def test_widening_or_a_new_list_scans_everything(records):
+    search = main.RecordSearch()
+    run(search, records, criteria(box="12"))
+
+    widened, result = run(search, records, criteria(box="1"))
+    assert widened.base is records
+    same_rows(result, criteria(box="1").apply(records, never))
+
+    fresh = main.TimedRecords(list(records), list(records.keys), records.rollup)
+    moved, result = run(search, fresh, criteria(box="12"))
+    assert moved.base is fresh
+    same_rows(result, criteria(box="12").apply(fresh, never))
+
+
+def test_changed_day_scans_everything(records):
+    search = main.RecordSearch()
+    day = next(record.day for record in records if record.day)
+    run(search, records, criteria(box="1"))
+
+    by_day = main.RecordFilter.from_inputs("1", "", "", day, None, None)
+    search_pass, result = run(search, records, by_day)
+    assert search_pass.base is records
+    same_rows(result, by_day.apply(records, never))
+
+
+def test_sparse_index_hits_keep_newest_first_order(records, index):
+    search = main.RecordSearch(index)
+    needle = records[0].search_keys[1][-6:]
+    filters = criteria(ttn=needle)
+    candidates = filters.index_candidates(index)
+    assert candidates is not None
+    assert len(candidates) * main.INDEX_SPARSE_RATIO < len(records)
+
+    _, result = run(search, records, filters)
+    same_rows(result, filters.apply(records, never))
+    assert result[0] is records[0]
@@ -0,0 +1,263 @@
+import queue
+
+import pytest
+
+import main
+from benchmarks.server import StandInServer
+
+TOKEN = "test-token"
+
+
+@pytest.fixture(params=["journal", "sqlite"])
+def offline_queue(request, queue_paths, monkeypatch):
+    monkeypatch.setattr(main, "OFFLINE_QUEUE_BACKEND", request.param)
+    monkeypatch.setattr(main.RecordApi, "_batch_unsupported_until", 0.0)
+    monkeypatch.setattr(main, "QUEUE_RETRY_BASE_DELAY", 0)
+    return main.OfflineQueue
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Start a :class:`StandInServer` with the given options and point the client at it."""
+
+    servers = []
+
+    def start(**options):
+        server = StandInServer(**options).__enter__()
+        servers.append(server)
+        monkeypatch.setattr(main, "API_BASE", server.base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.__exit__(None, None, None)
+
+
+def record(n):
+    return {"boxid": f"box{n}", "ttn": f"ttn{n}", "user_name": "Оператор"}
+
+
+def test_batch_endpoint_uploads_in_one_request(offline_queue, serve):
+    server = serve()
+    keys = [offline_queue.add_record(record(n)) for n in range(5)]
+
+    assert offline_queue.drain(TOKEN) == (5, 5)
+    assert server.calls == [("/add_records_batch", keys)]
+    assert set(server.stored) == set(keys)
+    assert offline_queue.pending_count() == 0
+
+
+def test_falls_back_to_single_posts_without_batch_endpoint(offline_queue, serve):
+    server = serve(batch_endpoint=False)
+    keys = [offline_queue.add_record(record(n)) for n in range(3)]
+
+    assert offline_queue.drain(TOKEN) == (3, 3)
+    paths = [path for path, _ in server.calls]
+    assert paths[0] == "/add_records_batch"
+    assert paths[1:] == ["/add_record"] * 3
+    assert sorted(key for _, sent in server.calls[1:] for key in sent) == sorted(keys)
+    assert not main.RecordApi.batch_available()
+
+    offline_queue.add_record(record(9))
+    offline_queue.drain(TOKEN)
+    assert server.calls[-1][0] == "/add_record"
+    assert [path for path, _ in server.calls].count("/add_records_batch") == 1
+
+
+def test_batch_endpoint_is_probed_again(offline_queue, serve, monkeypatch):
+    monkeypatch.setattr(main, "RECORD_BATCH_REPROBE_INTERVAL", 0)
+    server = serve(batch_endpoint=False)
+    offline_queue.add_record(record(1))
+    offline_queue.drain(TOKEN)
+
+    server.batch_endpoint = True
+    key = offline_queue.add_record(record(2))
+    offline_queue.drain(TOKEN)
+
+    assert server.calls[-1] == ("/add_records_batch", [key])
+
+
+@pytest.mark.parametrize("status", [400, 413, 422])
+def test_refused_batch_request_falls_back_to_single_posts(offline_queue, serve, status):
+    server = serve()
+    server.fail_next, server.fail_status = 1, status
+    keys = [offline_queue.add_record(record(n)) for n in range(3)]
+
+    assert offline_queue.drain(TOKEN) == (3, 3)
+    assert [path for path, _ in server.calls] == ["/add_records_batch"] + ["/add_record"] * 3
+    assert set(server.stored) == set(keys)
+    assert offline_queue.parked_count() == 0
+    assert main.RecordApi.batch_available()
+
+
+@pytest.mark.parametrize("batch_endpoint", [True, False])
+def test_retry_reuses_idempotency_key(offline_queue, serve, batch_endpoint):
+    server = serve(batch_endpoint=batch_endpoint)
+    server.fail_next = 1
+    key = offline_queue.add_record(record(1))
+
+    assert offline_queue.drain(TOKEN) == (0, 1)
+    assert offline_queue.pending_count() == 1
+    assert offline_queue.drain(TOKEN) == (1, 1)
+
+    sent = [keys for path, keys in server.calls if keys]
+    assert sent == [[key], [key]]
+    assert list(server.stored) == [key]
+
+
+@pytest.mark.parametrize("batch_endpoint", [True, False])
+def test_duplicates_and_rejections_are_reported(offline_queue, serve, monkeypatch, batch_endpoint):
+    monkeypatch.setattr(main, "QUEUE_MAX_ATTEMPTS", 1)
+    server = serve(batch_endpoint=batch_endpoint, reject_boxids={"bad"})
+    outcomes = {}
+    listener = lambda key, outcome, detail: outcomes.__setitem__(key, (outcome, detail))
+    offline_queue.add_outcome_listener(listener)
+    try:
+        server._accept("already-sent", record(1))
+        duplicate = offline_queue.add_record(record(1), "already-sent")
+        fresh = offline_queue.add_record(record(2))
+        rejected = offline_queue.add_record({**record(3), "boxid": "bad"})
+
+        assert offline_queue.drain(TOKEN) == (2, 3)
+    finally:
+        offline_queue.remove_outcome_listener(listener)
+
+    assert outcomes[duplicate] == ("ok", StandInServer.DUPLICATE_NOTE)
+    assert outcomes[fresh] == ("ok", "")
+    assert outcomes[rejected][0] == "rejected"
+    assert offline_queue.pending_count() == 0
+    assert offline_queue.store().claim(10) == []
+
+
+@pytest.mark.parametrize("status", [401, 403])
+@pytest.mark.parametrize("batch_endpoint", [True, False])
+def test_refused_session_keeps_records_queued(offline_queue, serve, monkeypatch, status, batch_endpoint):
+    monkeypatch.setattr(main, "QUEUE_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(main.OfflineQueue, "auth_rejected", False)
+    server = serve(batch_endpoint=batch_endpoint)
+    server.fail_next, server.fail_status = 1, status
+    keys = [offline_queue.add_record(record(n)) for n in range(3)]
+
+    offline_queue.drain(TOKEN)
+    assert offline_queue.auth_rejected
+    assert offline_queue.parked_count() == 0
+    assert offline_queue.pending_count() == 3 - len(server.stored)
+
+    offline_queue.drain(TOKEN)
+    assert not offline_queue.auth_rejected
+    assert offline_queue.pending_count() == 0
+    assert set(server.stored) == set(keys)
+
+
+@pytest.mark.parametrize("status", [400, 404, 408, 413])
+def test_other_client_errors_are_retried(offline_queue, serve, monkeypatch, status):
+    monkeypatch.setattr(main, "QUEUE_MAX_ATTEMPTS", 1)
+    server = serve(batch_endpoint=False)
+    server.fail_next, server.fail_status = 1, status
+    key = offline_queue.add_record(record(1))
+
+    assert offline_queue.drain(TOKEN) == (0, 1)
+    assert offline_queue.parked_count() == 0
+    assert offline_queue.drain(TOKEN) == (1, 1)
+    assert list(server.stored) == [key]
+
+
+def test_parked_records_are_counted_and_retried(offline_queue, serve, monkeypatch):
+    monkeypatch.setattr(main, "QUEUE_MAX_ATTEMPTS", 1)
+    server = serve(reject_boxids={"bad"})
+    key = offline_queue.add_record({**record(1), "boxid": "bad"})
+
+    assert offline_queue.drain(TOKEN) == (0, 1)
+    assert offline_queue.sync_summary() == ("⚠️ Відхилено сервером записів: 1", 1)
+
+    server.reject_boxids.clear()
+    assert offline_queue.store().retry_parked() == 1
+    assert offline_queue.drain(TOKEN) == (1, 1)
+    assert list(server.stored) == [key]
+    assert offline_queue.sync_summary() == ("", 0)
+
+
+def test_worker_reports_only_a_cleared_backlog(offline_queue, serve):
+    server = serve()
+    reports = queue.Queue()
+    worker = main.OfflineSyncWorker()
+    worker.add_listener(reports.put)
+    try:
+        offline_queue.add_record(record(1))
+        offline_queue.add_record(record(2))
+        worker.trigger(TOKEN)
+        assert reports.get(timeout=5) == 2
+
+        offline_queue.add_record(record(3))
+        worker.trigger()
+        assert reports.get(timeout=5) == 0
+
+        server.fail_next = 1
+        offline_queue.add_record(record(4))
+        worker.trigger()
+        assert reports.get(timeout=5) == 0
+        worker.trigger(urgent=True)
+        assert reports.get(timeout=5) == 1
+    finally:
+        worker.stop()
+    assert offline_queue.pending_count() == 0
+
+
+def test_worker_waits_out_its_backoff(offline_queue, serve):
+    server = serve()
+    reports = queue.Queue()
+    worker = main.OfflineSyncWorker()
+    worker.add_listener(reports.put)
+    try:
+        server.fail_next = 1
+        offline_queue.add_record(record(1))
+        worker.trigger(TOKEN)
+        assert reports.get(timeout=5) == 0
+
+        offline_queue.add_record(record(2))
+        worker.trigger()
+        with pytest.raises(queue.Empty):
+            reports.get(timeout=0.5)
+        assert len(server.calls) == 1
+
+        worker.trigger(urgent=True)
+        assert reports.get(timeout=5) == 1
+    finally:
+        worker.stop()
+    assert offline_queue.pending_count() == 0
+
+
+def test_failed_pass_releases_claimed_records(offline_queue, serve):
+    serve()
+    keys = [offline_queue.add_record(record(n)) for n in range(3)]
+    store = offline_queue.store()
+
+    def broken(done):
+        raise OSError("disk full")
+
+    store.mark_synced = broken
+    try:
+        with pytest.raises(OSError):
+            offline_queue.drain(TOKEN)
+    finally:
+        del store.mark_synced
+
+    assert [entry.key for entry in store.claim(10)] == keys
+
+
+def test_broken_outcome_listener_does_not_stop_the_pass(offline_queue, serve, monkeypatch):
+    serve()
+    errors = []
+    monkeypatch.setattr(main.sys, "excepthook", lambda *info: errors.append(info[0]))
+
+    def listener(key, outcome, detail):
+        raise RuntimeError(key)
+
+    offline_queue.add_outcome_listener(listener)
+    try:
+        for n in range(3):
+            offline_queue.add_record(record(n))
+        assert offline_queue.drain(TOKEN) == (3, 3)
+    finally:
+        offline_queue.remove_outcome_listener(listener)
+    assert errors == [RuntimeError] * 3
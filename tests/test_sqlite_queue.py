@@ -0,0 +1,108 @@
+import sqlite3
+import threading
+import time
+
+import main
+from main import SqliteQueueStore
+
+
+def record(n):
+    return {"boxid": f"box{n}", "ttn": f"ttn{n}", "user_name": "Оператор"}
+
+
+def test_runs_in_wal_mode(tmp_path):
+    store = SqliteQueueStore(tmp_path / "queue.sqlite3")
+
+    assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_claim_and_mark(tmp_path):
+    store = SqliteQueueStore(tmp_path / "queue.sqlite3")
+    for n in range(4):
+        store.append(record(n), f"k{n}")
+    store.append(record(0), "k0")
+
+    batch = store.claim(3)
+    assert [entry.key for entry in batch] == ["k0", "k1", "k2"]
+    assert [entry.key for entry in store.claim(10)] == ["k3"]
+
+    store.mark_synced(["k0"])
+    store.mark_failed(["k1"], "timeout")
+    store.release(["k2", "k3"])
+
+    assert store.count() == 3
+    assert [entry.key for entry in store.claim(10)] == ["k2", "k3"]
+
+
+def test_permanent_failures_are_parked(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "QUEUE_MAX_ATTEMPTS", 1)
+    store = SqliteQueueStore(tmp_path / "queue.sqlite3")
+    store.append(record(1), "k1")
+    store.claim(1)
+    store.mark_failed(["k1"], "HTTP 422", permanent=True)
+
+    assert store.count() == 0
+    assert store.records() == []
+    assert store.parked_count() == 1
+
+    assert store.retry_parked() == 1
+    assert store.parked_count() == 0
+    assert [entry.key for entry in store.claim(1)] == ["k1"]
+
+
+def test_stale_claims_return_to_pending(tmp_path, monkeypatch):
+    store = SqliteQueueStore(tmp_path / "queue.sqlite3")
+    store.append(record(1), "k1")
+    assert store.claim(1)
+    assert store.claim(1) == []
+
+    monkeypatch.setattr(main, "QUEUE_CLAIM_TIMEOUT", -1)
+    assert [entry.key for entry in store.claim(1)] == ["k1"]
+
+
+def test_concurrent_claims_never_overlap(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    store = SqliteQueueStore(path)
+    for n in range(200):
+        store.append(record(n), f"k{n}")
+    claimed = []
+    lock = threading.Lock()
+
+    def drain():
+        other = SqliteQueueStore(path)
+        while True:
+            batch = other.claim(7)
+            if not batch:
+                return
+            with lock:
+                claimed.extend(entry.key for entry in batch)
+
+    threads = [threading.Thread(target=drain) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(f"k{n}" for n in range(200))
+
+
+def test_upgrades_outbox_without_client_keys(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, "
+        "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+        "last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    now = time.time()
+    conn.execute(
+        "INSERT INTO outbox (payload, created_at, updated_at) VALUES (?, ?, ?)",
+        ('{"boxid": "old"}', now, now),
+    )
+    conn.commit()
+    conn.close()
+
+    batch = SqliteQueueStore(path).claim(10)
+
+    assert [entry.record for entry in batch] == [{"boxid": "old"}]
+    assert batch[0].key
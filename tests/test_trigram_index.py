@@ -0,0 +1,101 @@
+import time
+from array import array
+
+import pytest
+
+import main
+from benchmarks.synthetic import SyntheticConfig, generate_history
+
+
+def never():
+    return False
+
+
+@pytest.fixture(scope="module")
+def records():
+    items = generate_history(SyntheticConfig(rows=2_000, users=12, seed=7))
+    return main.TimedRecords(
+        sorted((main.TrackingRecord(item) for item in items), key=lambda r: r.sort_key, reverse=True)
+    )
+
+
+def built(records):
+    index = main.TrigramIndex()
+    index.add(records)
+    wait_for(index)
+    return index
+
+
+def wait_for(index, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while index.candidates(0, "000") is None:
+        assert time.monotonic() < deadline, "index build did not finish"
+        time.sleep(0.01)
+
+
+def needles(records):
+    sample = records[::97]
+    for record in sample:
+        box, ttn, user = record.search_keys
+        yield main.RecordFilter.from_inputs(box[2:6], "", "", None, None, None)
+        yield main.RecordFilter.from_inputs("", ttn[-5:], "", None, None, None)
+        yield main.RecordFilter.from_inputs("", "", user[:4], None, None, None)
+        yield main.RecordFilter.from_inputs(box[:3], "", user[-3:], None, None, None)
+    yield main.RecordFilter.from_inputs("zzz", "", "", None, None, None)
+
+
+def test_candidates_wait_for_the_background_build(records):
+    index = main.TrigramIndex()
+    index._builder = object()  # hold the build back
+    index.add(records)
+    assert index.candidates(0, "123") is None
+
+    index._build()
+    assert index._builder is None
+    assert index.candidates(0, "123") is not None
+
+
+def test_short_needles_are_not_indexed(records):
+    index = built(records)
+    assert index.candidates(0, "12") is None
+    assert main.RecordFilter.from_inputs("12", "", "", None, None, None).index_candidates(index) is None
+
+
+def test_postings_are_compact_row_arrays(records):
+    index = built(records)
+    assert all(isinstance(entry, array) and entry.typecode == "I" for entry in index._postings.values())
+    assert len(index._rows) == len(records)
+
+
+def test_indexed_filter_matches_a_plain_scan(records):
+    index = built(records)
+    for criteria in needles(records):
+        candidates = criteria.index_candidates(index)
+        assert candidates is not None
+        expected = criteria.apply(records, never)
+        assert set(expected) <= candidates
+        assert criteria.apply(records, never, candidates) == expected
+
+
+def test_removed_records_drop_out(records):
+    index = built(records)
+    removed = records[:100]
+    index.remove(removed)
+    kept = records[100:]
+
+    for criteria in needles(records):
+        candidates = criteria.index_candidates(index)
+        assert not candidates & set(removed)
+        assert criteria.apply(kept, never, candidates) == criteria.apply(kept, never)
+
+
+def test_mostly_blank_index_is_rebuilt(records):
+    index = built(records)
+    kept = records[: len(records) // 3]
+    index.remove(records[len(records) // 3:])
+    wait_for(index)
+
+    assert len(index._rows) == len(kept)
+    for criteria in needles(kept):
+        candidates = criteria.index_candidates(index)
+        assert criteria.apply(kept, never, candidates) == criteria.apply(kept, never)
@@ -1,23 +1,37 @@
 """Windows desktop adaptation of the Flutter TrackingApp for Windows."""
 from __future__ import annotations
 
+import bisect
 import calendar
 import csv
+import itertools
 import json
+import os
+import queue
+import sqlite3
+import sys
 import threading
-from collections import defaultdict
+import time
+import traceback
+import uuid
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from datetime import datetime, date, time as dtime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError as exc:  # pragma: no cover - handled at runtime
     raise SystemExit(
         "The 'requests' package is required. Install it with 'pip install requests'."
@@ -26,6 +40,80 @@ except ImportError as exc:  # pragma: no cover - handled at runtime
 API_BASE = "https://tracking-api-b4jb.onrender.com"
 STATE_PATH = Path(__file__).with_name("tracking_app_state.json")
 QUEUE_PATH = Path(__file__).with_name("offline_queue.json")
+QUEUE_JOURNAL_PATH = Path(__file__).with_name("offline_queue.journal")
+QUEUE_DB_PATH = Path(__file__).with_name("offline_queue.sqlite3")
+SCAN_METRICS_LOG_PATH = Path(__file__).with_name("scan_metrics.log")
+STALL_LOG_PATH = Path(__file__).with_name("ui_stalls.log")
+# Offline queue storage: "journal" (JSON checkpoint + journal) or "sqlite" (WAL outbox).
+OFFLINE_QUEUE_BACKEND = "journal"
+# Journal lines replayed at load time before they are folded into the checkpoint.
+QUEUE_COMPACT_THRESHOLD = 500
+# Records claimed per sync round trip to the store.
+QUEUE_SYNC_BATCH = 100
+# Rejected uploads are retried this many times before a record is parked as failed.
+QUEUE_MAX_ATTEMPTS = 10
+# Per-record HTTP statuses that mean the server refused the record itself; any
+# other failure keeps the record queued.
+RECORD_REJECT_STATUSES = (409, 422)
+# In-flight records of a crashed sync become pending again after this many seconds.
+QUEUE_CLAIM_TIMEOUT = 300
+# Synced outbox rows are kept this long (seconds) before being purged.
+QUEUE_SYNCED_RETENTION = 24 * 60 * 60
+# Retry backoff for a failed upload: base delay doubling per attempt, capped (seconds).
+QUEUE_RETRY_BASE_DELAY = 5
+QUEUE_RETRY_MAX_DELAY = 600
+# Uploads kept in flight while draining the offline queue.
+OFFLINE_SYNC_CONCURRENCY = 4
+# Consecutive network/server failures after which a drain pass gives up.
+OFFLINE_SYNC_MAX_TRANSIENT = 8
+# Scans per /add_records_batch request, and how long (seconds) to fall back to
+# single posts after the server reported that it has no batch endpoint.
+RECORD_BATCH_SIZE = 100
+RECORD_BATCH_REPROBE_INTERVAL = 60 * 60
+# Sync worker sleep (seconds): re-check interval while records wait for a retry,
+# and the backoff range used while the server is unreachable.
+OFFLINE_SYNC_RETRY_INTERVAL = 30
+OFFLINE_SYNC_BACKOFF_BASE = 5
+OFFLINE_SYNC_BACKOFF_MAX = 300
+# Connectivity probes (seconds): a HEAD is sent only after this long without
+# API traffic, and retried with this backoff range while the server is down.
+CONNECTIVITY_IDLE_INTERVAL = 15
+CONNECTIVITY_BACKOFF_BASE = 5
+CONNECTIVITY_BACKOFF_MAX = 120
+# Scans listed in the scanner's recent-scans strip.
+RECENT_SCANS_LIMIT = 6
+# Refresh period (ms) of the scan diagnostics view.
+DIAGNOSTICS_REFRESH_MS = 2000
+# Localhost port of the Prometheus-format /metrics endpoint; None keeps it off.
+METRICS_PORT: Optional[int] = None
+# UI heartbeat period (ms) and the event-loop lag (seconds) logged as a stall.
+UI_HEARTBEAT_MS = 100
+UI_STALL_THRESHOLD = 1.0
+
+# Connection pool sizing for the shared HTTP session: number of host pools and
+# keep-alive connections per host (extra requests wait for a free connection).
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 8
+
+# Records filtered between cancellation checks in background filter passes,
+# and the typing pause (ms) before live search re-filters.
+FILTER_CHUNK_SIZE = 2048
+FILTER_DEBOUNCE_MS = 250
+# Trigram candidates are confirmed directly (no list walk) when they are fewer
+# than 1/INDEX_SPARSE_RATIO of the records.
+INDEX_SPARSE_RATIO = 8
+# Record caches fetch the whole list instead of a since_id delta after this
+# many delta syncs or seconds, so rows deleted on the server drop out.
+RECORD_FULL_SYNC_EVERY = 10
+RECORD_FULL_SYNC_SECONDS = 5 * 60
+# Views kept alive for re-display, and the window (s) in which re-showing a
+# view reuses its data instead of revalidating it with the server.
+FRAME_CACHE_SIZE = 3
+FRAME_REVALIDATE_SECONDS = 10
+# Worker threads for background actions, and how often (ms) the UI thread runs
+# the callbacks they post back.
+TK_WORKER_THREADS = 4
+UI_DISPATCH_INTERVAL_MS = 25
 
 # Design constants for corporate-style UI
 PRIMARY_BG = "#0f172a"
@@ -139,6 +227,547 @@ class ManagedUser:
     updated_at: Optional[datetime]
 
 
+class HttpTransport:
+    """Process-wide pooled HTTP session shared by every API call."""
+
+    _session: Optional[requests.Session] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=HTTP_POOL_CONNECTIONS,
+                        pool_maxsize=HTTP_POOL_MAXSIZE,
+                        pool_block=True,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers["Connection"] = "keep-alive"
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def request(cls, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if url.startswith("/"):
+            url = f"{API_BASE}{url}"
+        endpoint = cls.endpoint(url)
+        started = time.perf_counter()
+        try:
+            response = cls.session().request(method, url, **kwargs)
+        except requests.RequestException:
+            # Any failure to get a response (refused, timed out, redirect loop,
+            # broken stream, bad URL) counts as the server being unreachable.
+            METRICS.inc("tracking_http_requests_total", method=method, endpoint=endpoint, status="error")
+            CONNECTIVITY.report(False)
+            raise
+        METRICS.observe(
+            "tracking_http_request_duration_seconds",
+            time.perf_counter() - started,
+            method=method,
+            endpoint=endpoint,
+        )
+        METRICS.inc(
+            "tracking_http_requests_total",
+            method=method,
+            endpoint=endpoint,
+            status=response.status_code,
+        )
+        CONNECTIVITY.report(response.status_code < 500)
+        return response
+
+    @staticmethod
+    def endpoint(url: str) -> str:
+        """Metrics label for ``url``: the API path with numeric ids collapsed."""
+
+        path = url[len(API_BASE):] if url.startswith(API_BASE) else url
+        path = path.split("?", 1)[0]
+        return "/".join(":id" if part.isdigit() else part for part in path.split("/")) or "/"
+
+    @classmethod
+    def get(cls, url: str, **kwargs: Any) -> requests.Response:
+        return cls.request("GET", url, **kwargs)
+
+    @classmethod
+    def post(cls, url: str, **kwargs: Any) -> requests.Response:
+        return cls.request("POST", url, **kwargs)
+
+    @classmethod
+    def delete(cls, url: str, **kwargs: Any) -> requests.Response:
+        return cls.request("DELETE", url, **kwargs)
+
+    @classmethod
+    def head(cls, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("allow_redirects", False)
+        return cls.request("HEAD", url, **kwargs)
+
+    @classmethod
+    def close(cls) -> None:
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
+
+class ConnectivityMonitor:
+    """Process-wide view of whether the API server is reachable.
+
+    Every request sent through :class:`HttpTransport` reports its outcome
+    here, so ordinary API traffic keeps the state current at no cost. One
+    background thread sends a ``HEAD`` probe only after
+    ``CONNECTIVITY_IDLE_INTERVAL`` seconds without traffic and, while the
+    server is unreachable, retries with an exponential backoff. Listeners are
+    called from the reporting thread whenever the state flips.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._probing = False
+        self._online: Optional[bool] = None
+        self._last_seen = 0.0
+        self._backoff = 0.0
+        self._listeners: List[Callable[[bool], None]] = []
+
+    @property
+    def online(self) -> Optional[bool]:
+        """Last known state, or ``None`` before the first request or probe."""
+
+        return self._online
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None:
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[bool], None]) -> None:
+        with self._lock:
+            self._listeners = [item for item in self._listeners if item != callback]
+
+    def start(self) -> None:
+        """Enable idle probing (the first probe runs right away if the state is unknown)."""
+
+        with self._lock:
+            self._probing = True
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="connectivity-monitor", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop probing; traffic reports still update the state."""
+
+        with self._lock:
+            self._probing = False
+
+    def report(self, online: bool) -> None:
+        with self._lock:
+            self._last_seen = time.monotonic()
+            changed = online != self._online
+            self._online = online
+            if online:
+                self._backoff = 0.0
+            listeners = list(self._listeners) if changed else []
+        if changed:
+            METRICS.inc("tracking_connectivity_changes_total", online=str(online).lower())
+        for callback in listeners:
+            callback(online)
+        if changed:
+            self._wake.set()
+
+    def _probe_delay(self) -> float:
+        if self._online is None:
+            return 0.0
+        wait = self._backoff if self._online is False else CONNECTIVITY_IDLE_INTERVAL
+        return wait - (time.monotonic() - self._last_seen)
+
+    def _probe(self) -> None:
+        METRICS.inc("tracking_connectivity_probes_total")
+        try:
+            HttpTransport.head(API_BASE, timeout=5)
+        except requests.RequestException:
+            # Also moves the next probe out when nothing else reported.
+            self.report(False)
+        with self._lock:
+            if self._online is False:
+                self._backoff = min(
+                    CONNECTIVITY_BACKOFF_MAX,
+                    max(CONNECTIVITY_BACKOFF_BASE, self._backoff * 2),
+                )
+
+    def _run(self) -> None:
+        timeout: Optional[float] = None
+        while True:
+            self._wake.wait(timeout)
+            self._wake.clear()
+            with self._lock:
+                if not self._probing:
+                    timeout = None
+                    continue
+                delay = self._probe_delay()
+            if delay > 0:
+                timeout = delay
+                continue
+            self._probe()
+            timeout = 0.0
+
+
+CONNECTIVITY = ConnectivityMonitor()
+
+
+class Histogram:
+    """Fixed-bucket histogram of millisecond timings, cheap enough for hot paths."""
+
+    BOUNDS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, bounds: Optional[Iterable[float]] = None) -> None:
+        self.bounds: Tuple[float, ...] = tuple(bounds) if bounds is not None else self.BOUNDS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.maximum = max(self.maximum, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile, capped at the maximum."""
+
+        with self._lock:
+            rank = q * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if count and seen >= rank:
+                    return min(self.bounds[index], self.maximum) if index < len(self.bounds) else self.maximum
+        return 0.0
+
+
+class ScanMetrics:
+    """Timings of the scan flow, kept in process for the diagnostics views.
+
+    A scan is timed from the Enter that submits it: ``commit`` until it sits
+    in the local outbox, then ``online`` until the server acknowledged it or
+    ``offline`` when it stayed queued locally. Upload round trips go to
+    ``rtt`` separately, so slow stations can be told apart as network- or
+    UI-bound. Every finished scan is also appended to ``log_path`` as one
+    JSON line.
+    """
+
+    RATE_WINDOW = 60.0
+
+    def __init__(self, log_path: Path) -> None:
+        self.log_path = log_path
+        self.histograms = {name: Histogram() for name in ("commit", "online", "offline", "rtt")}
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Any]] = {}
+        self._scans: Dict[str, Deque[float]] = defaultdict(deque)
+
+    def scan_started(self, key: str, user: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._pending[key] = [now, user, None]
+            self._scans[user].append(now)
+
+    def scan_committed(self, key: str) -> None:
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                return
+            entry[2] = (time.monotonic() - entry[0]) * 1000
+        self.histograms["commit"].observe(entry[2])
+
+    def scan_finished(self, key: str, online: bool) -> None:
+        with self._lock:
+            entry = self._pending.pop(key, None)
+        if entry is None:
+            return
+        started, user, commit_ms = entry
+        elapsed = (time.monotonic() - started) * 1000
+        self.histograms["online" if online else "offline"].observe(elapsed)
+        METRICS.observe(
+            "tracking_scan_ack_seconds", elapsed / 1000, mode="online" if online else "offline"
+        )
+        line = json.dumps(
+            {
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "user": user,
+                "online": online,
+                "enter_to_ack_ms": round(elapsed, 1),
+                "commit_ms": None if commit_ms is None else round(commit_ms, 1),
+            },
+            ensure_ascii=False,
+        )
+        try:
+            with self._lock, self.log_path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+        except OSError:
+            pass
+
+    def record_rtt(self, elapsed_ms: float) -> None:
+        self.histograms["rtt"].observe(elapsed_ms)
+
+    def scans_per_minute(self) -> Dict[str, int]:
+        cutoff = time.monotonic() - self.RATE_WINDOW
+        with self._lock:
+            for times in self._scans.values():
+                while times and times[0] < cutoff:
+                    times.popleft()
+            return {user: len(times) for user, times in self._scans.items() if times}
+
+    def report_lines(self) -> List[str]:
+        online = self.histograms["online"]
+        offline = self.histograms["offline"]
+        lines = [f"Сканувань: {online.count + offline.count} (онлайн {online.count}, офлайн {offline.count})"]
+        for name, title in (
+            ("commit", "Enter → локальне збереження"),
+            ("online", "Enter → підтвердження сервера"),
+            ("offline", "Enter → офлайн-черга"),
+            ("rtt", "RTT сервера"),
+        ):
+            histogram = self.histograms[name]
+            lines.append(
+                f"{title}: середнє {histogram.mean:.0f} мс, p50 ≤ {histogram.quantile(0.5):.0f} мс, "
+                f"p95 ≤ {histogram.quantile(0.95):.0f} мс, макс {histogram.maximum:.0f} мс"
+            )
+        lines.append("Сканувань за хвилину:")
+        rates = self.scans_per_minute()
+        lines.extend(f"  {user}: {count}" for user, count in sorted(rates.items()))
+        if not rates:
+            lines.append("  —")
+        lines.append(f"Журнал: {self.log_path}")
+        return lines
+
+
+SCAN_METRICS = ScanMetrics(SCAN_METRICS_LOG_PATH)
+
+
+class MetricsRegistry:
+    """Process-wide counters, gauges and histograms in Prometheus text format.
+
+    Metrics are keyed by name plus keyword labels. Histograms reuse
+    :class:`Histogram` with bounds in seconds. Gauges can also be registered
+    as callbacks that are read only when :meth:`render` runs, so values such
+    as the queue depth cost nothing between scrapes. :meth:`serve` exposes
+    ``/metrics`` on localhost.
+    """
+
+    SECONDS_BOUNDS = tuple(bound / 1000 for bound in Histogram.BOUNDS)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+        self._gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._callbacks: Dict[str, Callable[[], float]] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def gauge_callback(self, name: str, callback: Callable[[], float]) -> None:
+        with self._lock:
+            self._callbacks[name] = callback
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = self._key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.SECONDS_BOUNDS))
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    @staticmethod
+    def _series(name: str, labels: Iterable[Tuple[str, str]], value: float) -> str:
+        pairs = ",".join(
+            '{}="{}"'.format(label, text.replace("\\", "\\\\").replace('"', '\\"'))
+            for label, text in labels
+        )
+        return f"{name}{{{pairs}}} {value:g}" if pairs else f"{name} {value:g}"
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = dict(self._gauges)
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            callbacks = dict(self._callbacks)
+        for name, callback in callbacks.items():
+            try:
+                gauges[(name, ())] = float(callback())
+            except Exception:  # noqa: BLE001 - a broken gauge must not break the scrape
+                continue
+        lines: List[str] = []
+        typed: Set[str] = set()
+
+        def declare(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(self._series(name, labels, value))
+        for (name, labels), value in sorted(gauges.items()):
+            declare(name, "gauge")
+            lines.append(self._series(name, labels, value))
+        for (name, labels), histogram in histograms:
+            declare(name, "histogram")
+            with histogram._lock:
+                counts = list(histogram.counts)
+                total, count = histogram.total, histogram.count
+            cumulative = 0
+            for bound, bucket in zip(histogram.bounds + (float("inf"),), counts):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(self._series(f"{name}_bucket", labels + (("le", le),), cumulative))
+            lines.append(self._series(f"{name}_sum", labels, total))
+            lines.append(self._series(f"{name}_count", labels, count))
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int) -> None:
+        """Serve :meth:`render` at ``http://127.0.0.1:<port>/metrics`` from a daemon thread."""
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - base signature
+                pass
+
+        with self._lock:
+            if self._server is not None:
+                return
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+            self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="metrics-endpoint", daemon=True
+        ).start()
+
+
+METRICS = MetricsRegistry()
+
+
+METRICS.gauge_callback("tracking_offline_queue_depth", lambda: OfflineQueue.pending_count())
+METRICS.gauge_callback("tracking_connectivity_online", lambda: float(CONNECTIVITY.online is True))
+
+
+class StallWatchdog:
+    """Detects UI event-loop stalls and logs where the UI thread was stuck.
+
+    The UI toolkit calls :meth:`beat` from a ``UI_HEARTBEAT_MS`` timer on its
+    own thread. A daemon thread checks how long ago the last beat was; once
+    that passes ``threshold`` seconds it captures the UI thread's stack from
+    :func:`sys._current_frames` and appends it to ``log_path``, taking
+    another sample for every further ``threshold`` the stall lasts. The
+    next beat logs the total stall time.
+    """
+
+    def __init__(self, threshold: float, log_path: Path) -> None:
+        self.threshold = threshold
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._ui_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._stalled_since: Optional[float] = None
+        self._sampled_at = 0.0
+
+    def start(self) -> None:
+        """Watch the calling (UI) thread; safe to call more than once."""
+
+        with self._lock:
+            self._ui_thread_id = threading.get_ident()
+            self._last_beat = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ui-stall-watchdog", daemon=True
+                )
+                self._thread.start()
+
+    def beat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            lag = now - self._last_beat - UI_HEARTBEAT_MS / 1000
+            self._last_beat = now
+            stalled_since, self._stalled_since = self._stalled_since, None
+        METRICS.observe("tracking_ui_loop_lag_seconds", max(0.0, lag))
+        if stalled_since is not None:
+            self._write(f"UI thread resumed after {now - stalled_since:.2f} s\n")
+
+    def _run(self) -> None:
+        interval = min(self.threshold / 4, UI_HEARTBEAT_MS / 1000 * 2)
+        while True:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                blocked = now - self._last_beat
+                if blocked < self.threshold or now - self._sampled_at < self.threshold:
+                    continue
+                if self._stalled_since is None:
+                    self._stalled_since = self._last_beat
+                    METRICS.inc("tracking_ui_stalls_total")
+                self._sampled_at = now
+                thread_id = self._ui_thread_id
+            frame = sys._current_frames().get(thread_id) if thread_id is not None else None
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "  <no frame>\n"
+            self._write(f"UI thread blocked for {blocked:.2f} s:\n{stack}")
+
+    def _write(self, text: str) -> None:
+        stamp = datetime.now().isoformat(timespec="milliseconds")
+        try:
+            with self.log_path.open("a", encoding="utf-8") as handle:
+                handle.write(f"[{stamp}] {text}")
+        except OSError:
+            pass
+
+
+UI_WATCHDOG = StallWatchdog(UI_STALL_THRESHOLD, STALL_LOG_PATH)
+
+
 class UserApi:
     @staticmethod
     def _url(path: str) -> str:
@@ -172,7 +801,7 @@ class UserApi:
         token: Optional[str] = None,
         json_data: Optional[Dict[str, Any]] = None,
     ) -> Any:
-        response = requests.request(
+        response = HttpTransport.request(
             method,
             UserApi._url(path),
             headers=UserApi._headers(token),
@@ -330,6 +959,141 @@ class UserApi:
         )
 
 
+class RecordApi:
+    """Scan submission endpoints; every POST carries an ``Idempotency-Key``.
+
+    Upload helpers report each record as ``(outcome, detail)`` where
+    ``outcome`` is ``"ok"`` (detail is the server's duplicate note),
+    ``"rejected"`` for ``RECORD_REJECT_STATUSES``, ``"unauthorized"`` for 401
+    and 403, or ``"transient"`` for network errors and every other status.
+    """
+
+    # Monotonic time until which the batch endpoint is assumed missing.
+    _batch_unsupported_until = 0.0
+
+    @staticmethod
+    def _auth_headers(token: str, idempotency_key: str) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Idempotency-Key": idempotency_key,
+        }
+
+    @staticmethod
+    def classify(status_code: int) -> str:
+        if 200 <= status_code < 300:
+            return "ok"
+        if status_code in (401, 403):
+            return "unauthorized"
+        if status_code in RECORD_REJECT_STATUSES:
+            return "rejected"
+        return "transient"
+
+    @staticmethod
+    def add_record(
+        token: str,
+        record: Dict[str, Any],
+        idempotency_key: str,
+        *,
+        timeout: float = 10,
+    ) -> requests.Response:
+        return HttpTransport.post(
+            f"{API_BASE}/add_record",
+            json=record,
+            headers=RecordApi._auth_headers(token, idempotency_key),
+            timeout=timeout,
+        )
+
+    @staticmethod
+    def upload(token: str, record: Dict[str, Any], idempotency_key: str) -> Tuple[str, str]:
+        started = time.monotonic()
+        try:
+            response = RecordApi.add_record(token, record, idempotency_key)
+        except requests.RequestException as exc:
+            return "transient", str(exc) or exc.__class__.__name__
+        SCAN_METRICS.record_rtt((time.monotonic() - started) * 1000)
+        outcome = RecordApi.classify(response.status_code)
+        if outcome != "ok":
+            return outcome, f"HTTP {response.status_code}"
+        try:
+            payload = response.json() if response.content else {}
+        except ValueError:
+            payload = {}
+        note = str(payload.get("note", "") or "") if isinstance(payload, dict) else ""
+        return "ok", note
+
+    @classmethod
+    def batch_available(cls) -> bool:
+        return time.monotonic() >= cls._batch_unsupported_until
+
+    @classmethod
+    def upload_batch(
+        cls, token: str, items: List[Tuple[str, Dict[str, Any]]]
+    ) -> Optional[Dict[str, Tuple[str, str]]]:
+        """POST ``(key, record)`` pairs to ``/add_records_batch`` in one request.
+
+        The server answers ``{"results": [{"idempotency_key", "status",
+        "note"}]}`` with an HTTP-style status per item. Returns outcomes by
+        key, or ``None`` when the caller should send these records as single
+        posts: the server has no batch endpoint (probed again after
+        ``RECORD_BATCH_REPROBE_INTERVAL``) or refused the request as a whole,
+        e.g. a 400 or 413 for the body. Only per-item statuses reject a
+        record. Items missing from the answer are reported as transient so
+        they are retried.
+        """
+
+        keys = [key for key, _ in items]
+        batch_key = uuid.uuid5(uuid.NAMESPACE_OID, ",".join(keys)).hex
+        payload = {
+            "records": [{**record, "idempotency_key": key} for key, record in items]
+        }
+        started = time.monotonic()
+        try:
+            response = HttpTransport.post(
+                f"{API_BASE}/add_records_batch",
+                json=payload,
+                headers=cls._auth_headers(token, batch_key),
+                timeout=30,
+            )
+        except requests.RequestException as exc:
+            detail = str(exc) or exc.__class__.__name__
+            return {key: ("transient", detail) for key in keys}
+        SCAN_METRICS.record_rtt((time.monotonic() - started) * 1000)
+        if response.status_code in (404, 405, 501):
+            cls._batch_unsupported_until = time.monotonic() + RECORD_BATCH_REPROBE_INTERVAL
+            return None
+        outcome = cls.classify(response.status_code)
+        if outcome == "unauthorized" or response.status_code in (408, 429) or response.status_code >= 500:
+            return {key: (outcome, f"HTTP {response.status_code}") for key in keys}
+        if outcome != "ok":
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        results = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(results, list):
+            return {key: ("transient", "Некоректна відповідь сервера") for key in keys}
+        outcomes: Dict[str, Tuple[str, str]] = {}
+        for item in results:
+            if not isinstance(item, dict):
+                continue
+            key = str(item.get("idempotency_key") or "")
+            try:
+                status_code = int(item.get("status", 200))
+            except (TypeError, ValueError):
+                status_code = 500
+            item_outcome = cls.classify(status_code)
+            if item_outcome == "ok":
+                outcomes[key] = ("ok", str(item.get("note", "") or ""))
+            else:
+                outcomes[key] = (item_outcome, f"HTTP {status_code}")
+        return {
+            key: outcomes.get(key, ("transient", "Відсутній у відповіді сервера"))
+            for key in keys
+        }
+
+
 def normalize_role(role_name: Optional[str], access_level: Optional[int]) -> UserRole:
     return UserRole.from_value(role_name, access_level)
 
@@ -381,60 +1145,835 @@ class AppState:
         STATE_PATH.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
 
 
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next upload of a record that failed ``attempts`` times."""
+
+    return min(QUEUE_RETRY_MAX_DELAY, QUEUE_RETRY_BASE_DELAY * (2 ** min(attempts, 20)))
+
+
+@dataclass
+class QueuedRecord:
+    entry_id: int
+    key: str
+    record: Dict[str, Any]
+
+
+class JournalQueueStore:
+    """Offline queue kept as a compacted checkpoint plus an append-only journal.
+
+    ``QUEUE_PATH`` holds the checkpoint ``{"last_seq": n, "entries": [...]}``
+    and every change is appended to ``QUEUE_JOURNAL_PATH`` as one line: a new
+    record as ``{"seq", "key", "record"}``, uploaded records as
+    ``{"op": "synced", "keys"}`` and failed uploads as ``{"op": "failed",
+    "entries"}`` carrying each record's absolute attempt count, retry time
+    and parked flag. Both files are read once; after that the store works
+    from an in-memory index kept in ``seq`` order and only appends. Journal
+    records with ``seq <= last_seq`` are already part of the checkpoint and
+    replaying ``op`` lines twice is harmless, which makes a crash between the
+    two steps of a compaction harmless too. A torn last line is skipped on
+    load. Older builds wrote a bare list of records without keys; those
+    entries get negative sequence numbers and fresh keys, persisted by an
+    immediate compaction.
+    """
+
+    def __init__(self, checkpoint_path: Path, journal_path: Path) -> None:
+        self.checkpoint_path = checkpoint_path
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, QueuedRecord]] = None
+        self._next_seq = 1
+        self._journal_entries = 0
+        self._in_flight: set[str] = set()
+        self._attempts: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._parked: set[str] = set()
+
+    @staticmethod
+    def _parse_entry(item: Any) -> Optional[QueuedRecord]:
+        if not isinstance(item, dict):
+            return None
+        seq = item.get("seq")
+        record = item.get("record")
+        if not isinstance(seq, int) or not isinstance(record, dict):
+            return None
+        return QueuedRecord(seq, str(item.get("key") or ""), record)
+
+    def _read_checkpoint(self) -> Tuple[int, List[Dict[str, Any]]]:
+        if not self.checkpoint_path.exists():
+            return 0, []
+        try:
+            data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        except Exception:
+            self.checkpoint_path.unlink(missing_ok=True)
+            return 0, []
+        last_seq = 0
+        if isinstance(data, dict):
+            try:
+                last_seq = int(data.get("last_seq", 0) or 0)
+            except (TypeError, ValueError):
+                last_seq = 0
+            if "entries" in data:
+                return last_seq, [item for item in data.get("entries") or [] if isinstance(item, dict)]
+            data = data.get("records") or []
+        if not isinstance(data, list):
+            return last_seq, []
+        legacy = [item for item in data if isinstance(item, dict)]
+        return last_seq, [
+            {"seq": index - len(legacy), "key": "", "record": item}
+            for index, item in enumerate(legacy)
+        ]
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        lines: List[Dict[str, Any]] = []
+        if not self.journal_path.exists():
+            return lines
+        with self.journal_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(item, dict):
+                    lines.append(item)
+        return lines
+
+    def _repair_journal_tail(self) -> None:
+        """Terminate a line torn by a crash so the next append starts cleanly."""
+
+        try:
+            with self.journal_path.open("rb+") as handle:
+                handle.seek(0, os.SEEK_END)
+                if handle.tell() == 0:
+                    return
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    handle.write(b"\n")
+        except FileNotFoundError:
+            pass
+
+    def _apply_state(self, item: Dict[str, Any]) -> None:
+        key = str(item.get("key") or "")
+        try:
+            attempts = int(item.get("attempts", 0) or 0)
+            retry_at = float(item.get("retry_at", 0) or 0)
+        except (TypeError, ValueError):
+            return
+        if attempts:
+            self._attempts[key] = attempts
+            self._retry_at[key] = retry_at
+        else:
+            self._attempts.pop(key, None)
+            self._retry_at.pop(key, None)
+        if item.get("parked"):
+            self._parked.add(key)
+        else:
+            self._parked.discard(key)
+
+    def _index_locked(self) -> Dict[str, QueuedRecord]:
+        """Return the in-memory index, reading the files on first use."""
+
+        if self._entries is not None:
+            return self._entries
+        checkpoint_seq, stored = self._read_checkpoint()
+        journal = self._read_journal()
+        self._repair_journal_tail()
+        loaded: List[QueuedRecord] = []
+        for item in stored:
+            entry = self._parse_entry(item)
+            if entry is not None:
+                loaded.append(entry)
+                if entry.key:
+                    self._apply_state(item)
+        removed: set[str] = set()
+        last_seq = checkpoint_seq
+        for item in journal:
+            op = item.get("op")
+            if op == "synced":
+                removed.update(str(key) for key in item.get("keys") or [])
+            elif op == "failed":
+                for state in item.get("entries") or []:
+                    if isinstance(state, dict):
+                        self._apply_state(state)
+            else:
+                entry = self._parse_entry(item)
+                if entry is not None and entry.entry_id > checkpoint_seq:
+                    loaded.append(entry)
+                    last_seq = max(last_seq, entry.entry_id)
+        self._next_seq = last_seq + 1
+        self._journal_entries = len(journal)
+        entries: Dict[str, QueuedRecord] = {}
+        needs_compaction = self._journal_entries >= QUEUE_COMPACT_THRESHOLD
+        for entry in sorted(loaded, key=lambda item: item.entry_id):
+            if not entry.key:
+                entry.key = uuid.uuid4().hex
+                needs_compaction = True
+            if entry.key in entries:
+                needs_compaction = True
+                continue
+            if entry.key in removed:
+                continue
+            entries[entry.key] = entry
+        self._entries = entries
+        for state in (self._attempts, self._retry_at):
+            for key in [key for key in state if key not in entries]:
+                del state[key]
+        self._parked.intersection_update(entries)
+        if needs_compaction:
+            self._compact_locked()
+        return entries
+
+    def _compact_locked(self) -> None:
+        entries = self._entries or {}
+        payload = {
+            "last_seq": self._next_seq - 1,
+            "entries": [
+                {
+                    "seq": entry.entry_id,
+                    "key": entry.key,
+                    "record": entry.record,
+                    **self._state(entry.key),
+                }
+                for entry in entries.values()
+            ],
+        }
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.checkpoint_path)
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_entries = 0
+
+    def _state(self, key: str) -> Dict[str, Any]:
+        if key not in self._attempts and key not in self._parked:
+            return {}
+        return self._state_line(key)
+
+    def _state_line(self, key: str) -> Dict[str, Any]:
+        return {
+            "attempts": self._attempts.get(key, 0),
+            "retry_at": self._retry_at.get(key, 0.0),
+            "parked": key in self._parked,
+        }
+
+    def _write_locked(self, item: Dict[str, Any]) -> None:
+        with self.journal_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(item, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._journal_entries += 1
+        if self._journal_entries >= QUEUE_COMPACT_THRESHOLD or not self._entries:
+            self._compact_locked()
+
+    def append(self, record: Dict[str, Any], key: str) -> None:
+        with self._lock:
+            entries = self._index_locked()
+            if key in entries:
+                return
+            seq = self._next_seq
+            self._next_seq = seq + 1
+            entries[key] = QueuedRecord(seq, key, record)
+            self._write_locked({"seq": seq, "key": key, "record": record})
+
+    def records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                entry.record
+                for entry in self._index_locked().values()
+                if entry.key not in self._parked
+            ]
+
+    def count(self) -> int:
+        """Records still to upload; parked records are not counted."""
+
+        with self._lock:
+            return len(self._index_locked()) - len(self._parked)
+
+    def parked_count(self) -> int:
+        with self._lock:
+            self._index_locked()
+            return len(self._parked)
+
+    def retry_parked(self) -> int:
+        """Queue parked records again with a fresh attempt count."""
+
+        with self._lock:
+            self._index_locked()
+            parked = list(self._parked)
+            if not parked:
+                return 0
+            for key in parked:
+                self._attempts.pop(key, None)
+                self._retry_at.pop(key, None)
+            self._parked.clear()
+            self._write_locked(
+                {"op": "failed", "entries": [{"key": key, **self._state_line(key)} for key in parked]}
+            )
+            return len(parked)
+
+    def claim(self, limit: int, after: Optional[int] = None) -> List[QueuedRecord]:
+        now = time.time()
+        with self._lock:
+            batch: List[QueuedRecord] = []
+            for entry in self._index_locked().values():
+                if after is not None and entry.entry_id <= after:
+                    continue
+                if entry.key in self._in_flight or entry.key in self._parked:
+                    continue
+                if self._retry_at.get(entry.key, 0) > now:
+                    continue
+                batch.append(entry)
+                if len(batch) >= limit:
+                    break
+            self._in_flight.update(entry.key for entry in batch)
+            return batch
+
+    def mark_synced(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            entries = self._index_locked()
+            done = [key for key in keys if key in entries]
+            if not done:
+                return
+            for key in done:
+                del entries[key]
+                self._in_flight.discard(key)
+                self._attempts.pop(key, None)
+                self._retry_at.pop(key, None)
+                self._parked.discard(key)
+            self._write_locked({"op": "synced", "keys": done})
+
+    def mark_failed(
+        self, keys: Iterable[str], error: str = "", *, permanent: bool = False  # noqa: ARG002
+    ) -> None:
+        now = time.time()
+        with self._lock:
+            entries = self._index_locked()
+            failed = [key for key in keys if key in entries]
+            if not failed:
+                return
+            for key in failed:
+                self._in_flight.discard(key)
+                attempts = self._attempts.get(key, 0)
+                self._attempts[key] = attempts + 1
+                self._retry_at[key] = now + retry_delay(attempts)
+                if permanent and attempts + 1 >= QUEUE_MAX_ATTEMPTS:
+                    self._parked.add(key)
+            self._write_locked(
+                {"op": "failed", "entries": [{"key": key, **self._state(key)} for key in failed]}
+            )
+
+    def release(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._in_flight.difference_update(keys)
+
+
+class SqliteQueueStore:
+    """Offline queue in a SQLite outbox table running in WAL mode.
+
+    Each row carries its client key, status (pending / in_flight / synced /
+    failed), attempt count and timestamps; the ``(status, id)`` index lets a
+    sync pass claim the next batch without reading the whole queue. Claiming
+    happens in an immediate transaction, so several windows or processes can
+    drain the same database without sending a record twice.
+    """
+
+    PENDING = "pending"
+    IN_FLIGHT = "in_flight"
+    SYNCED = "synced"
+    FAILED = "failed"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS outbox_status_id ON outbox (status, id);
+            """
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}
+        if "client_key" not in columns:
+            conn.execute("ALTER TABLE outbox ADD COLUMN client_key TEXT")
+        if "next_attempt_at" not in columns:
+            conn.execute(
+                "ALTER TABLE outbox ADD COLUMN next_attempt_at REAL NOT NULL DEFAULT 0"
+            )
+        conn.execute(
+            "UPDATE outbox SET client_key = lower(hex(randomblob(16))) WHERE client_key IS NULL"
+        )
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS outbox_client_key ON outbox (client_key)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _update_status(self, keys: List[str], sql: str, *params: Any) -> None:
+        if not keys:
+            return
+        placeholders = ",".join("?" for _ in keys)
+        conn = self._connection()
+        conn.execute(f"{sql} WHERE client_key IN ({placeholders})", (*params, *keys))
+
+    def append(self, record: Dict[str, Any], key: str) -> None:
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR IGNORE INTO outbox (client_key, payload, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, json.dumps(record, ensure_ascii=False), self.PENDING, now, now),
+        )
+
+    def records(self) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT payload FROM outbox WHERE status IN (?, ?) ORDER BY id",
+            (self.PENDING, self.IN_FLIGHT),
+        )
+        return [json.loads(payload) for (payload,) in rows]
+
+    def count(self) -> int:
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM outbox WHERE status IN (?, ?)",
+            (self.PENDING, self.IN_FLIGHT),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def parked_count(self) -> int:
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM outbox WHERE status = ?", (self.FAILED,)
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def retry_parked(self) -> int:
+        """Queue parked records again with a fresh attempt count."""
+
+        cursor = self._connection().execute(
+            "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = 0, updated_at = ? "
+            "WHERE status = ?",
+            (self.PENDING, time.time(), self.FAILED),
+        )
+        return cursor.rowcount
+
+    def claim(self, limit: int, after: Optional[int] = None) -> List[QueuedRecord]:
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE outbox SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (self.PENDING, now, self.IN_FLIGHT, now - QUEUE_CLAIM_TIMEOUT),
+            )
+            rows = conn.execute(
+                "SELECT id, client_key, payload FROM outbox "
+                "WHERE status = ? AND id > ? AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (self.PENDING, after if after is not None else 0, now, limit),
+            ).fetchall()
+            batch = [
+                QueuedRecord(row_id, key, json.loads(payload)) for row_id, key, payload in rows
+            ]
+            self._update_status(
+                [entry.key for entry in batch],
+                "UPDATE outbox SET status = ?, updated_at = ?",
+                self.IN_FLIGHT,
+                now,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return batch
+
+    def mark_synced(self, keys: Iterable[str]) -> None:
+        now = time.time()
+        self._update_status(
+            list(keys), "UPDATE outbox SET status = ?, updated_at = ?", self.SYNCED, now
+        )
+        self._connection().execute(
+            "DELETE FROM outbox WHERE status = ? AND updated_at < ?",
+            (self.SYNCED, now - QUEUE_SYNCED_RETENTION),
+        )
+
+    def mark_failed(
+        self, keys: Iterable[str], error: str = "", *, permanent: bool = False
+    ) -> None:
+        now = time.time()
+        self._update_status(
+            list(keys),
+            "UPDATE outbox SET attempts = attempts + 1, last_error = ?, updated_at = ?, "
+            "next_attempt_at = ? + min(?, ? * (1 << min(attempts, 20))), "
+            "status = CASE WHEN ? AND attempts + 1 >= ? THEN ? ELSE ? END",
+            error,
+            now,
+            now,
+            QUEUE_RETRY_MAX_DELAY,
+            QUEUE_RETRY_BASE_DELAY,
+            int(permanent),
+            QUEUE_MAX_ATTEMPTS,
+            self.FAILED,
+            self.PENDING,
+        )
+
+    def release(self, keys: Iterable[str]) -> None:
+        self._update_status(
+            list(keys), "UPDATE outbox SET status = ?, updated_at = ?", self.PENDING, time.time()
+        )
+
+
+class OfflineSyncWorker:
+    """Single background thread that owns draining of the offline queue.
+
+    Submits, logins and connectivity changes only call :meth:`trigger`.
+    Triggers that arrive while a pass is running collapse into one follow-up
+    pass, and while the server keeps failing the thread sleeps with an
+    exponential backoff instead of retrying on every scan: a trigger during
+    the backoff only runs once it has elapsed, unless it is ``urgent`` or
+    brings a new token.
+
+    Listeners are called after every pass that processed records with the
+    size of the backlog it cleared: the records that were already waiting
+    before the pass, reported once the queue is empty. Scans uploaded by the
+    pass that picked them up report 0.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._token = ""
+        self._backoff = 0.0
+        self._resume_at = 0.0
+        # Records left after the last pass; None until the first pass.
+        self._backlog: Optional[int] = None
+        self._listeners: List[
+            Tuple[Callable[[int], None], Optional[Callable[[int, int], None]]]
+        ] = []
+
+    def add_listener(
+        self,
+        callback: Callable[[int], None],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        with self._lock:
+            self._listeners.append((callback, progress))
+
+    def remove_listener(self, callback: Callable[[int], None]) -> None:
+        with self._lock:
+            self._listeners = [item for item in self._listeners if item[0] != callback]
+
+    def trigger(self, token: Optional[str] = None, *, urgent: bool = False) -> None:
+        with self._lock:
+            if urgent or (token is not None and token != self._token):
+                self._resume_at = 0.0
+            if token is not None:
+                self._token = token
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="offline-sync-worker", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Forget the token so no further passes run until the next login."""
+
+        with self._lock:
+            self._token = ""
+
+    def _report_progress(self, done: int, total: int) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for _, progress in listeners:
+            if progress:
+                progress(done, total)
+
+    def _run(self) -> None:
+        timeout: Optional[float] = None
+        while True:
+            self._wake.wait(timeout)
+            self._wake.clear()
+            with self._lock:
+                token = self._token
+                delay = self._resume_at - time.monotonic()
+            if not token:
+                timeout = None
+                continue
+            if delay > 0:
+                timeout = delay
+                continue
+            backlog = self._backlog
+            try:
+                if backlog is None:
+                    backlog = OfflineQueue.pending_count()
+                synced, processed = OfflineQueue.drain(token, self._report_progress)
+                remaining = OfflineQueue.pending_count()
+                self._backlog = remaining
+            except Exception:  # noqa: BLE001 - keep the worker alive
+                sys.excepthook(*sys.exc_info())
+                METRICS.inc("tracking_offline_drain_errors_total")
+                synced, processed, remaining = 0, 1, 1
+            if processed:
+                cleared = min(backlog or 0, synced) if not remaining else 0
+                with self._lock:
+                    listeners = list(self._listeners)
+                for callback, _ in listeners:
+                    callback(cleared)
+            if processed and not synced:
+                self._backoff = min(
+                    OFFLINE_SYNC_BACKOFF_MAX,
+                    max(OFFLINE_SYNC_BACKOFF_BASE, self._backoff * 2),
+                )
+                timeout = self._backoff
+            else:
+                self._backoff = 0.0
+                timeout = OFFLINE_SYNC_RETRY_INTERVAL if remaining else None
+            with self._lock:
+                self._resume_at = time.monotonic() + self._backoff if self._backoff else 0.0
+
+
 class OfflineQueue:
     _lock = threading.Lock()
+    _store: Optional[Any] = None
+    _worker: Optional[OfflineSyncWorker] = None
+    _outcome_listeners: List[Callable[[str, str, str], None]] = []
+    # Set when the server refused the session token during a pass; cleared by
+    # the next pass that uploads records without a refusal.
+    auth_rejected = False
+
+    @classmethod
+    def store(cls) -> Any:
+        with cls._lock:
+            if cls._store is None:
+                if OFFLINE_QUEUE_BACKEND == "sqlite":
+                    cls._store = SqliteQueueStore(QUEUE_DB_PATH)
+                else:
+                    cls._store = JournalQueueStore(QUEUE_PATH, QUEUE_JOURNAL_PATH)
+            return cls._store
+
+    @classmethod
+    def worker(cls) -> OfflineSyncWorker:
+        with cls._lock:
+            if cls._worker is None:
+                cls._worker = OfflineSyncWorker()
+            return cls._worker
 
     @staticmethod
-    def _load() -> List[Dict[str, Any]]:
-        if QUEUE_PATH.exists():
-            try:
-                return json.loads(QUEUE_PATH.read_text(encoding="utf-8"))
-            except Exception:
-                QUEUE_PATH.unlink(missing_ok=True)
-        return []
+    def new_key() -> str:
+        return uuid.uuid4().hex
 
     @classmethod
-    def add_record(cls, record: Dict[str, Any]) -> None:
+    def add_outcome_listener(cls, callback: Callable[[str, str, str], None]) -> None:
+        """Call ``callback(key, outcome, detail)`` for every record a drain pass uploads."""
+
         with cls._lock:
-            pending = cls._load()
-            pending.append(record)
-            QUEUE_PATH.write_text(json.dumps(pending, indent=2), encoding="utf-8")
+            cls._outcome_listeners = cls._outcome_listeners + [callback]
 
     @classmethod
-    def sync_pending(
-        cls, token: str, callback: Optional[Callable[[int], None]] = None
-    ) -> None:
-        def worker() -> None:
-            with cls._lock:
-                pending = cls._load()
-            if not pending or not token:
-                return
-            synced: List[Dict[str, Any]] = []
-            for record in pending:
+    def remove_outcome_listener(cls, callback: Callable[[str, str, str], None]) -> None:
+        with cls._lock:
+            cls._outcome_listeners = [item for item in cls._outcome_listeners if item != callback]
+
+    @staticmethod
+    def describe_outcome(outcome: str, detail: str) -> str:
+        """Status text for a :class:`RecordApi` upload outcome."""
+
+        if outcome == "ok":
+            return f"⚠️ Дублікат: {detail}" if detail else "✅ Успішно додано"
+        if outcome == "rejected":
+            return f"❌ Відхилено сервером ({detail})"
+        if outcome == "unauthorized":
+            return "🔒 Сесія недійсна. Увійдіть знову, щоб надіслати запис."
+        return "📦 Збережено локально (офлайн)"
+
+    @classmethod
+    def sync_summary(cls, cleared: int = 0) -> Tuple[str, int]:
+        """Status line for the offline queue and the number of parked records."""
+
+        parked = cls.parked_count()
+        parts: List[str] = []
+        if cls.auth_rejected:
+            parts.append("🔒 Сервер не прийняв сесію. Увійдіть знову, щоб надіслати записи з черги.")
+        if parked:
+            parts.append(f"⚠️ Відхилено сервером записів: {parked}")
+        if cleared:
+            parts.append(f"Синхронізовано {cleared} записів з офлайн-черги")
+        return " • ".join(parts), parked
+
+    @classmethod
+    def _load(cls) -> List[Dict[str, Any]]:
+        return cls.store().records()
+
+    @classmethod
+    def pending_count(cls) -> int:
+        return cls.store().count()
+
+    @classmethod
+    def parked_count(cls) -> int:
+        """Records the server refused ``QUEUE_MAX_ATTEMPTS`` times; kept until retried."""
+
+        return cls.store().parked_count()
+
+    @classmethod
+    def retry_parked(cls, token: str) -> int:
+        count = cls.store().retry_parked()
+        if count:
+            cls.sync_pending(token, urgent=True)
+        return count
+
+    @classmethod
+    def add_record(cls, record: Dict[str, Any], key: Optional[str] = None) -> str:
+        """Queue ``record`` under its idempotency ``key`` (generated if missing)."""
+
+        key = key or cls.new_key()
+        cls.store().append(record, key)
+        return key
+
+    @classmethod
+    def drain(
+        cls, token: str, progress: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[int, int]:
+        """Upload the queue, one batch request per claimed chunk when possible.
+
+        Without a batch endpoint records go out as single posts with
+        ``OFFLINE_SYNC_CONCURRENCY`` requests in flight. Failed records get
+        their own retry state in the store and do not stop the pass; only
+        ``OFFLINE_SYNC_MAX_TRANSIENT`` consecutive network or server errors
+        abort it. A refused session token aborts it at once and leaves the
+        record queued without counting an attempt. Returns ``(synced,
+        processed)``.
+        """
+
+        store = cls.store()
+        total = store.count()
+        started = time.perf_counter()
+        synced = processed = consecutive = 0
+        last_report = 0.0
+        cursor: Optional[int] = None
+        aborted = refused = False
+        done: List[str] = []
+        # Claimed keys whose store state is decided (failed, released or synced);
+        # the rest of a batch is released when it ends, even on an error.
+        settled: Set[str] = set()
+
+        def handle(entry: QueuedRecord, outcome: str, detail: str) -> None:
+            nonlocal processed, consecutive, aborted, refused, last_report
+            processed += 1
+            METRICS.inc("tracking_offline_records_total", outcome=outcome)
+            SCAN_METRICS.scan_finished(entry.key, online=outcome in ("ok", "rejected"))
+            if outcome == "ok":
+                done.append(entry.key)
+                consecutive = 0
+            elif outcome == "unauthorized":
+                cls.auth_rejected = refused = True
+                store.release([entry.key])
+                aborted = True
+            elif outcome == "rejected":
+                store.mark_failed([entry.key], detail, permanent=True)
+                consecutive = 0
+            else:
+                store.mark_failed([entry.key], detail)
+                consecutive += 1
+                if consecutive >= OFFLINE_SYNC_MAX_TRANSIENT:
+                    aborted = True
+            if outcome != "ok":
+                settled.add(entry.key)
+            for listener in cls._outcome_listeners:
                 try:
-                    response = requests.post(
-                        f"{API_BASE}/add_record",
-                        json=record,
-                        headers={
-                            "Authorization": f"Bearer {token}",
-                            "Content-Type": "application/json",
-                        },
-                        timeout=10,
-                    )
-                    if response.status_code == 200:
-                        synced.append(record)
-                except requests.RequestException:
+                    listener(entry.key, outcome, detail)
+                except Exception:  # noqa: BLE001 - a broken listener must not stall the queue
+                    sys.excepthook(*sys.exc_info())
+            if progress and time.monotonic() - last_report >= 0.5:
+                last_report = time.monotonic()
+                progress(synced + len(done), total)
+
+        with ThreadPoolExecutor(
+            max_workers=OFFLINE_SYNC_CONCURRENCY, thread_name_prefix="offline-sync"
+        ) as pool:
+            while not aborted:
+                batch = store.claim(QUEUE_SYNC_BATCH, cursor)
+                if not batch:
                     break
-            if synced:
-                with cls._lock:
-                    remaining = [r for r in cls._load() if r not in synced]
-                    QUEUE_PATH.write_text(
-                        json.dumps(remaining, indent=2), encoding="utf-8"
-                    )
-            if callback:
-                callback(len(synced))
+                cursor = batch[-1].entry_id
+                done.clear()
+                settled.clear()
+                try:
+                    outcomes: Optional[Dict[str, Tuple[str, str]]] = None
+                    if RecordApi.batch_available():
+                        outcomes = {}
+                        for start in range(0, len(batch), RECORD_BATCH_SIZE):
+                            chunk = batch[start:start + RECORD_BATCH_SIZE]
+                            result = RecordApi.upload_batch(
+                                token, [(entry.key, entry.record) for entry in chunk]
+                            )
+                            if result is None:
+                                outcomes = None
+                                break
+                            outcomes.update(result)
+                    if outcomes is not None:
+                        for entry in batch:
+                            if aborted:
+                                break
+                            handle(entry, *outcomes[entry.key])
+                    else:
+                        futures = {
+                            pool.submit(RecordApi.upload, token, entry.record, entry.key): entry
+                            for entry in batch
+                        }
+                        for future in as_completed(futures):
+                            if future.cancelled():
+                                continue
+                            handle(futures[future], *future.result())
+                            if aborted:
+                                for pending in futures:
+                                    pending.cancel()
+                finally:
+                    # Keys left unhandled by an abort or an error go back to the
+                    # queue instead of staying claimed until a restart.
+                    try:
+                        store.mark_synced(done)
+                        settled.update(done)
+                    finally:
+                        store.release([entry.key for entry in batch if entry.key not in settled])
+                synced += len(done)
+        if synced and not refused:
+            cls.auth_rejected = False
+        if progress and processed:
+            progress(synced, total)
+        elapsed = time.perf_counter() - started
+        METRICS.observe("tracking_offline_drain_seconds", elapsed)
+        METRICS.inc("tracking_offline_synced_total", synced)
+        if aborted:
+            METRICS.inc("tracking_offline_drain_aborted_total")
+        if processed:
+            METRICS.set_gauge("tracking_offline_drain_rate", synced / elapsed if elapsed else 0.0)
+        return synced, processed
+
+    @classmethod
+    def sync_pending(cls, token: str, *, urgent: bool = False) -> None:
+        """Ask the background worker for a drain pass with ``token``.
+
+        ``urgent`` skips a running backoff, e.g. when the connection is back.
+        """
 
-        threading.Thread(target=worker, daemon=True).start()
+        cls.worker().trigger(token, urgent=urgent)
+
+    @classmethod
+    def stop_sync(cls) -> None:
+        cls.worker().stop()
 
 
 def parse_api_datetime(value: Optional[str]) -> Optional[datetime]:
@@ -453,6 +1992,705 @@ def parse_api_datetime(value: Optional[str]) -> Optional[datetime]:
             return None
 
 
+UNKNOWN_USER_NAME = "Невідомий користувач"
+_MIN_MOMENT = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class TrackingRecord:
+    """History or error row with its ``datetime`` parsed once on arrival.
+
+    ``moment`` is the aware timestamp, ``local``/``day`` its naive local time
+    and date used by period filters and daily rollups, and ``user`` the
+    display name used for per-user counters. ``search_keys`` holds the
+    lower-cased boxid, ttn and user name that text filters match against.
+    Other payload fields are read through :meth:`get` like on the original
+    dict.
+    """
+
+    __slots__ = ("data", "moment", "local", "day", "user", "display_time", "search_keys")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+        moment = parse_api_datetime(data.get("datetime"))
+        self.moment = moment
+        self.local = moment.astimezone().replace(tzinfo=None) if moment else None
+        self.day = self.local.date() if self.local else None
+        self.user = str(data.get("user_name") or "").strip() or UNKNOWN_USER_NAME
+        self.display_time = (
+            moment.strftime("%d.%m.%Y %H:%M:%S") if moment else str(data.get("datetime") or "")
+        )
+        self.search_keys = (
+            str(data.get("boxid", "")).lower(),
+            str(data.get("ttn", "")).lower(),
+            str(data.get("user_name", "")).lower(),
+        )
+
+    @property
+    def sort_key(self) -> datetime:
+        return self.moment or _MIN_MOMENT
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+
+class TrigramIndex:
+    """Trigram postings over the lower-cased boxid, ttn and user name of records.
+
+    Records are queued by :meth:`add` as they arrive and indexed by a
+    background thread, so a first large sync never waits for indexing. Each
+    indexed record gets a row number and postings are compact
+    ``array("I")`` lists of row numbers (about 4 bytes per trigram instead
+    of a set entry), which keeps a million-row cache in the low hundreds of
+    megabytes. :meth:`remove` only blanks the row; postings are rebuilt once
+    more than half of the rows are blank. :meth:`candidates` intersects the
+    postings of every trigram in a needle, giving a superset of the records
+    that contain it (callers still confirm with a substring test). It
+    returns ``None`` while indexing is behind or the needle is shorter than
+    three characters; callers then scan.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: Dict[Tuple[int, str], array] = {}
+        self._rows: List[Optional[TrackingRecord]] = []
+        self._row_of: Dict[TrackingRecord, int] = {}
+        self._pending: Set[TrackingRecord] = set()
+        self._builder: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, records: Iterable[TrackingRecord]) -> None:
+        with self._lock:
+            self._pending.update(records)
+            self._start_builder_locked()
+
+    def _start_builder_locked(self) -> None:
+        if self._pending and self._builder is None:
+            self._builder = threading.Thread(
+                target=self._build, name="trigram-index", daemon=True
+            )
+            self._builder.start()
+
+    def remove(self, records: Iterable[TrackingRecord]) -> None:
+        with self._lock:
+            for record in records:
+                if record in self._pending:
+                    self._pending.discard(record)
+                    continue
+                row = self._row_of.pop(record, None)
+                if row is not None:
+                    self._rows[row] = None
+            if len(self._row_of) * 2 < len(self._rows):
+                # Mostly blank rows: re-queue the live records for a fresh build.
+                self._pending.update(self._row_of)
+                self._postings = {}
+                self._rows = []
+                self._row_of = {}
+                self._start_builder_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings = {}
+            self._rows = []
+            self._row_of = {}
+            self._pending = set()
+
+    def _index_locked(self, records: Iterable[TrackingRecord]) -> None:
+        postings = self._postings
+        for record in records:
+            row = len(self._rows)
+            self._rows.append(record)
+            self._row_of[record] = row
+            for field, text in enumerate(record.search_keys):
+                for gram in self._grams(text):
+                    entry = postings.get((field, gram))
+                    if entry is None:
+                        entry = postings[(field, gram)] = array("I")
+                    entry.append(row)
+
+    def _build(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._builder = None
+                    return
+                chunk = [self._pending.pop() for _ in range(min(FILTER_CHUNK_SIZE, len(self._pending)))]
+                self._index_locked(chunk)
+
+    def candidates(self, field: int, needle: str) -> Optional[Set[TrackingRecord]]:
+        if len(needle) < 3:
+            return None
+        with self._lock:
+            if self._pending:
+                return None
+            postings = [self._postings.get((field, gram)) for gram in self._grams(needle)]
+            if any(entry is None for entry in postings):
+                return set()
+            postings.sort(key=len)
+            rows = set(postings[0])
+            for entry in postings[1:]:
+                rows.intersection_update(entry)
+                if not rows:
+                    break
+            records = self._rows
+            return {records[row] for row in rows if records[row] is not None}
+
+
+class DayRollup:
+    """Per-day, per-user counts of dated records.
+
+    :meth:`updated` returns a new rollup that copies only the day buckets it
+    touches, so a record cache can follow delta syncs without recounting the
+    days it already holds, and older snapshots stay unchanged.
+    """
+
+    __slots__ = ("days",)
+
+    def __init__(self, days: Optional[Dict[date, Dict[str, int]]] = None) -> None:
+        self.days: Dict[date, Dict[str, int]] = days if days is not None else {}
+
+    def updated(
+        self,
+        added: Iterable[TrackingRecord] = (),
+        removed: Iterable[TrackingRecord] = (),
+    ) -> "DayRollup":
+        days = dict(self.days)
+        copied: Set[date] = set()
+
+        def bucket(day: date) -> Dict[str, int]:
+            if day not in copied:
+                copied.add(day)
+                days[day] = dict(days.get(day, {}))
+            return days[day]
+
+        for record in added:
+            if record.day:
+                users = bucket(record.day)
+                users[record.user] = users.get(record.user, 0) + 1
+        for record in removed:
+            if record.day in days:
+                users = bucket(record.day)
+                left = users.get(record.user, 0) - 1
+                if left > 0:
+                    users[record.user] = left
+                else:
+                    users.pop(record.user, None)
+        return DayRollup({day: users for day, users in days.items() if users})
+
+    @staticmethod
+    def totals(buckets: Iterable[Dict[str, int]]) -> Dict[str, int]:
+        """Sum per-user counts across day buckets."""
+
+        totals: Dict[str, int] = defaultdict(int)
+        for users in buckets:
+            for user, count in users.items():
+                totals[user] += count
+        return dict(totals)
+
+
+class TimedRecords(list):
+    """Records sorted newest first with a parallel ascending array of time keys.
+
+    ``keys[i]`` is the negated UTC timestamp of ``self[i]``, so period and day
+    queries are answered by :meth:`between` with two binary searches and a
+    slice. ``rollup`` holds the per-day, per-user counts used by
+    :meth:`day_counts`. Record caches publish a new instance on every change
+    instead of mutating one that callers may still hold.
+    """
+
+    _UNDATED_KEY = -_MIN_MOMENT.timestamp()
+
+    def __init__(
+        self,
+        records: Iterable[TrackingRecord] = (),
+        keys: Optional[List[float]] = None,
+        rollup: Optional[DayRollup] = None,
+    ) -> None:
+        super().__init__(records)
+        self.keys = keys if keys is not None else [self.time_key(record) for record in self]
+        self.rollup = rollup if rollup is not None else DayRollup().updated(self)
+
+    @staticmethod
+    def time_key(record: TrackingRecord) -> float:
+        return -record.sort_key.timestamp()
+
+    @classmethod
+    def of(cls, records: List[TrackingRecord]) -> "TimedRecords":
+        """Return ``records`` itself when it already carries time keys."""
+
+        return records if isinstance(records, cls) else cls(records)
+
+    def between(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> List[TrackingRecord]:
+        """Dated records with ``start <= time <= end``; naive bounds are local time."""
+
+        keys = self.keys
+        lo = 0 if end is None else bisect.bisect_left(keys, -end.timestamp())
+        hi = (
+            bisect.bisect_left(keys, self._UNDATED_KEY)
+            if start is None
+            else bisect.bisect_right(keys, -start.timestamp())
+        )
+        return self[lo:hi] if lo < hi else []
+
+    def day_counts(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> Dict[date, Dict[str, int]]:
+        """Per-day, per-user counts of the records between ``start`` and ``end``.
+
+        Days covered entirely come straight from the rollup; only the boundary
+        days cut by ``start``/``end`` are counted from the records themselves.
+        """
+
+        first = start.date() if start else None
+        last = end.date() if end else None
+        result = {
+            day: users
+            for day, users in self.rollup.days.items()
+            if (first is None or day > first or (day == first and start.time() == dtime.min))
+            and (last is None or day < last or (day == last and end.time() == dtime.max))
+        }
+        for day in {first, last} - {None} - result.keys():
+            low = datetime.combine(day, dtime.min)
+            high = datetime.combine(day, dtime.max)
+            low = max(start, low) if start else low
+            high = min(end, high) if end else high
+            if low > high:
+                continue
+            users: Dict[str, int] = defaultdict(int)
+            for record in self.between(low, high):
+                users[record.user] += 1
+            if users:
+                result[day] = dict(users)
+        return result
+
+
+class RecordCache:
+    """Local copy of a ``/get_history``-style list kept sorted newest first.
+
+    :meth:`sync` asks the server only for records after the newest cached
+    ``id``/``datetime`` (``since_id``/``since`` query parameters). A server
+    that ignores them returns the full list, which is recognised by an id
+    older than the newest cached one (``since_id`` may be inclusive) and
+    diffed on the client instead: only unseen
+    records are wrapped in :class:`TrackingRecord` and sorted before being
+    merged into the cached order, and records that disappeared on the server
+    are dropped. The list is held as :class:`TimedRecords` so time-range
+    queries can bisect it and statistics can sum its day rollup.
+
+    Delta responses never report deletions, so every
+    ``RECORD_FULL_SYNC_EVERY`` syncs (or ``RECORD_FULL_SYNC_SECONDS``) the
+    cache asks for the whole list. A response to a request without ``since``
+    parameters is authoritative: cached records it does not contain are
+    dropped.
+
+    Responses are also revalidated with ``If-None-Match``/``If-Modified-Since``
+    from the last ``ETag``/``Last-Modified`` of the same query, so a ``304``
+    reuses the cached list without downloading or parsing the body again.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._records = TimedRecords()
+        self._keys: Set[Any] = set()
+        self._last_id: Optional[int] = None
+        self._last_datetime: Optional[str] = None
+        self._validators: Optional[Tuple[Tuple[Tuple[str, Any], ...], Dict[str, str]]] = None
+        self._delta_syncs = 0
+        self._full_synced_at = 0.0
+        self.index = TrigramIndex()
+
+    @staticmethod
+    def _numeric_id(record: Dict[str, Any]) -> Optional[int]:
+        try:
+            return int(float(record.get("id")))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def record_key(record: Dict[str, Any]) -> Any:
+        record_id = record.get("id")
+        if record_id is not None:
+            return str(record_id)
+        return (
+            record.get("datetime"),
+            record.get("boxid"),
+            record.get("ttn"),
+            record.get("user_name"),
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self) -> None:
+        self._records = TimedRecords()
+        self._keys = set()
+        self._last_id = None
+        self._last_datetime = None
+        self._validators = None
+        self._delta_syncs = 0
+        self._full_synced_at = 0.0
+        self.index.clear()
+
+    def discard(self, record_id: Any) -> None:
+        key = str(record_id)
+        with self._lock:
+            if key not in self._keys:
+                return
+            self._keys.discard(key)
+            self._drop(lambda record: self.record_key(record.data) != key)
+
+    def sync(self, token: str) -> TimedRecords:
+        """Fetch what is new since the last sync and return the full sorted list.
+
+        The returned list is shared and must not be modified.
+        """
+
+        with self._lock:
+            if token != self._token:
+                self._token = token
+                self._clear_locked()
+            params: Dict[str, Any] = {}
+            full = (
+                not self._records
+                or self._delta_syncs >= RECORD_FULL_SYNC_EVERY
+                or time.monotonic() - self._full_synced_at >= RECORD_FULL_SYNC_SECONDS
+            )
+            if not full:
+                if self._last_id is not None:
+                    params["since_id"] = self._last_id
+                if self._last_datetime:
+                    params["since"] = self._last_datetime
+            query = tuple(sorted(params.items()))
+            headers = {"Authorization": f"Bearer {token}"}
+            if self._validators and self._validators[0] == query:
+                headers.update(self._validators[1])
+        response = HttpTransport.get(
+            self.path,
+            headers=headers,
+            params=params or None,
+            timeout=10,
+        )
+        if response.status_code == 304:
+            with self._lock:
+                if token == self._token:
+                    self._count_sync(bool(params))
+                return self._records
+        if response.status_code != 200:
+            raise requests.RequestException(f"status {response.status_code}")
+        data = response.json()
+        if not isinstance(data, list):
+            raise requests.RequestException("Некоректна відповідь сервера")
+        conditional: Dict[str, str] = {}
+        if response.headers.get("ETag"):
+            conditional["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            conditional["If-Modified-Since"] = response.headers["Last-Modified"]
+        with self._lock:
+            if token == self._token:
+                self._apply(data, bool(params))
+                self._validators = (query, conditional) if conditional else None
+                self._count_sync(bool(params))
+            return self._records
+
+    def _count_sync(self, incremental: bool) -> None:
+        if incremental:
+            self._delta_syncs += 1
+        else:
+            self._delta_syncs = 0
+            self._full_synced_at = time.monotonic()
+
+    def _apply(self, data: List[Dict[str, Any]], incremental: bool) -> None:
+        data = [item for item in data if isinstance(item, dict)]
+        last_id = self._last_id
+        is_full_list = not incremental or any(
+            (record_id := self._numeric_id(item)) is not None
+            and last_id is not None
+            and record_id < last_id
+            for item in data
+        )
+        if is_full_list:
+            seen = {self.record_key(item) for item in data}
+            if self._keys - seen:
+                self._drop(lambda record: self.record_key(record.data) in seen)
+                self._keys &= seen
+        fresh: List[Dict[str, Any]] = []
+        for item in data:
+            key = self.record_key(item)
+            if key not in self._keys:
+                self._keys.add(key)
+                fresh.append(item)
+        if fresh:
+            self._merge(fresh)
+
+    def _drop(self, keep: Callable[[TrackingRecord], bool]) -> None:
+        old_records = self._records
+        kept: List[TrackingRecord] = []
+        keys: List[float] = []
+        removed: List[TrackingRecord] = []
+        for record, key in zip(old_records, old_records.keys):
+            if keep(record):
+                kept.append(record)
+                keys.append(key)
+            else:
+                removed.append(record)
+        self.index.remove(removed)
+        self._records = TimedRecords(kept, keys, old_records.rollup.updated(removed=removed))
+
+    def _merge(self, fresh: List[Dict[str, Any]]) -> None:
+        incoming = sorted(
+            (TrackingRecord(item) for item in fresh),
+            key=lambda record: record.sort_key,
+            reverse=True,
+        )
+        incoming_keys = [TimedRecords.time_key(record) for record in incoming]
+        records: List[TrackingRecord] = []
+        keys: List[float] = []
+        old_records = self._records
+        old_keys = old_records.keys
+        i = j = 0
+        while i < len(old_records) and j < len(incoming):
+            if incoming_keys[j] < old_keys[i]:
+                records.append(incoming[j])
+                keys.append(incoming_keys[j])
+                j += 1
+            else:
+                records.append(old_records[i])
+                keys.append(old_keys[i])
+                i += 1
+        records.extend(old_records[i:])
+        keys.extend(old_keys[i:])
+        records.extend(incoming[j:])
+        keys.extend(incoming_keys[j:])
+        self._records = TimedRecords(records, keys, old_records.rollup.updated(added=incoming))
+        self.index.add(incoming)
+        newest_id = max(
+            (record_id for item in fresh if (record_id := self._numeric_id(item)) is not None),
+            default=None,
+        )
+        if newest_id is not None and (self._last_id is None or newest_id > self._last_id):
+            self._last_id = newest_id
+        if records and records[0].moment:
+            self._last_datetime = str(records[0].get("datetime") or "") or None
+
+
+HISTORY_CACHE = RecordCache("/get_history")
+ERRORS_CACHE = RecordCache("/get_errors")
+
+
+@dataclass(frozen=True)
+class RecordFilter:
+    """History/error filter criteria; :meth:`apply` is safe to run off the UI thread."""
+
+    box: str = ""
+    ttn: str = ""
+    user: str = ""
+    day: Optional[date] = None
+    start: Optional[dtime] = None
+    end: Optional[dtime] = None
+
+    @classmethod
+    def from_inputs(
+        cls,
+        box: str,
+        ttn: str,
+        user: str,
+        day: Optional[date],
+        start: Optional[dtime],
+        end: Optional[dtime],
+    ) -> "RecordFilter":
+        return cls(box.strip().lower(), ttn.strip().lower(), user.strip().lower(), day, start, end)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.box or self.ttn or self.user or self.day or self.start or self.end)
+
+    def narrows(self, previous: "RecordFilter") -> bool:
+        """True when every record matching these criteria also matches ``previous``."""
+
+        return (
+            previous.box in self.box
+            and previous.ttn in self.ttn
+            and previous.user in self.user
+            and (self.day, self.start, self.end) == (previous.day, previous.start, previous.end)
+        )
+
+    def matches(self, record: TrackingRecord) -> bool:
+        box_key, ttn_key, user_key = record.search_keys
+        if self.box and self.box not in box_key:
+            return False
+        if self.ttn and self.ttn not in ttn_key:
+            return False
+        if self.user and self.user not in user_key:
+            return False
+        if self.day or self.start or self.end:
+            if not record.local:
+                return False
+            if self.day and record.day != self.day:
+                return False
+            tm = record.local.time()
+            if self.start and tm < self.start:
+                return False
+            if self.end and tm > self.end:
+                return False
+        return True
+
+    def apply(
+        self,
+        records: List[TrackingRecord],
+        cancelled: Callable[[], bool],
+        candidates: Optional[Set[TrackingRecord]] = None,
+    ) -> Optional[List[TrackingRecord]]:
+        """Return the matching records, or ``None`` once ``cancelled()`` is true.
+
+        ``candidates`` (from :class:`TrigramIndex`) lets the scan skip records
+        that cannot match with a set lookup instead of substring tests.
+        """
+
+        if self.is_empty:
+            return list(records)
+        if self.day and isinstance(records, TimedRecords):
+            records = records.between(*self.day_bounds())
+        result: List[TrackingRecord] = []
+        for offset in range(0, len(records), FILTER_CHUNK_SIZE):
+            if cancelled():
+                return None
+            chunk = records[offset:offset + FILTER_CHUNK_SIZE]
+            if candidates is not None:
+                chunk = [record for record in chunk if record in candidates]
+            result.extend(record for record in chunk if self.matches(record))
+        return result
+
+    def day_bounds(self) -> Tuple[datetime, datetime]:
+        """Local datetime range selected by ``day`` and the optional start/end times."""
+
+        return (
+            datetime.combine(self.day, self.start or dtime.min),
+            datetime.combine(self.day, self.end or dtime.max),
+        )
+
+    def index_candidates(self, index: TrigramIndex) -> Optional[Set[TrackingRecord]]:
+        """Intersect the index postings of every needle long enough to use them."""
+
+        result: Optional[Set[TrackingRecord]] = None
+        for field, needle in enumerate((self.box, self.ttn, self.user)):
+            found = index.candidates(field, needle)
+            if found is None:
+                continue
+            result = found if result is None else result & found
+            if not result:
+                break
+        return result
+
+
+class LatestOnly:
+    """Generation counter: starting a request makes every earlier one stale."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def start(self) -> Callable[[], bool]:
+        """Begin a request and return a check that turns true once it is superseded."""
+
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        return lambda: self._generation != generation
+
+
+class SearchPass:
+    """One filter run started by :meth:`RecordSearch.begin`."""
+
+    def __init__(
+        self,
+        search: "RecordSearch",
+        records: List[TrackingRecord],
+        base: List[TrackingRecord],
+        criteria: RecordFilter,
+        cancelled: Callable[[], bool],
+    ) -> None:
+        self.search = search
+        self.records = records
+        self.base = base
+        self.criteria = criteria
+        self.cancelled = cancelled
+
+    def run(self) -> Optional[List[TrackingRecord]]:
+        criteria = self.criteria
+        index = self.search.index
+        candidates = criteria.index_candidates(index) if index is not None else None
+        if candidates is None:
+            return criteria.apply(self.base, self.cancelled)
+        if self.base is self.records and len(candidates) * INDEX_SPARSE_RATIO < len(self.records):
+            # Few candidates: confirm them directly instead of walking the list.
+            members = self.search.members(self.records)
+            hits = [record for record in candidates if record in members and criteria.matches(record)]
+            hits.sort(key=lambda record: record.sort_key, reverse=True)
+            return None if self.cancelled() else hits
+        return criteria.apply(self.base, self.cancelled, candidates)
+
+    def commit(self, result: Optional[List[TrackingRecord]]) -> bool:
+        """Remember ``result`` (on the UI thread) if this pass is still the latest."""
+
+        if result is None or self.cancelled():
+            return False
+        self.search._remember(self.records, self.criteria, result)
+        return True
+
+
+class RecordSearch:
+    """Latest-wins, incremental filtering over a page's record list.
+
+    Each :meth:`begin` supersedes the pass still running. When the new
+    criteria only narrow the last committed ones over the same record list
+    (e.g. one more character typed into a field), the pass rescans the
+    previous result instead of every record. With an ``index`` (the record
+    cache's :class:`TrigramIndex`), text needles of three or more characters
+    are answered from the index postings.
+    """
+
+    def __init__(self, index: Optional[TrigramIndex] = None) -> None:
+        self.index = index
+        self._requests = LatestOnly()
+        self._members: Tuple[Optional[List[TrackingRecord]], Set[TrackingRecord]] = (None, set())
+        self._source: Optional[List[TrackingRecord]] = None
+        self._criteria: Optional[RecordFilter] = None
+        self._result: List[TrackingRecord] = []
+
+    def begin(self, records: List[TrackingRecord], criteria: RecordFilter) -> SearchPass:
+        base = records
+        if (
+            self._source is records
+            and self._criteria is not None
+            and criteria.narrows(self._criteria)
+        ):
+            base = self._result
+        return SearchPass(self, records, base, criteria, self._requests.start())
+
+    def members(self, records: List[TrackingRecord]) -> Set[TrackingRecord]:
+        """Set view of ``records``, built once per record list."""
+
+        owner, members = self._members
+        if owner is not records:
+            members = set(records)
+            self._members = (records, members)
+        return members
+
+    def _remember(
+        self, records: List[TrackingRecord], criteria: RecordFilter, result: List[TrackingRecord]
+    ) -> None:
+        self._source = records
+        self._criteria = criteria
+        self._result = result
+
+
 def create_large_entry(
     parent: tk.Misc,
     *,
@@ -814,38 +3052,373 @@ class TimePickerDialog(tk.Toplevel):
         except ValueError:
             messagebox.showerror("Помилка", "Невірний час")
             return
-        hours %= 24
-        minutes %= 60
-        self.result = dtime(hour=hours, minute=minutes)
-        self._cancelled = False
-        self.destroy()
+        hours %= 24
+        minutes %= 60
+        self.result = dtime(hour=hours, minute=minutes)
+        self._cancelled = False
+        self.destroy()
+
+    def _close(self) -> None:
+        self._cancelled = True
+        self.destroy()
+
+    def show(self) -> Optional[dtime]:
+        self.wait_window()
+        if self._cancelled:
+            return self._initial
+        return self.result
+
+
+class VirtualTreeview:
+    """Shows a long row list in a ``ttk.Treeview`` without inserting every row.
+
+    Only as many items as fit in the viewport are created; scrolling rewrites
+    their values from the backing list, so a new filter result is swapped in
+    with a single :meth:`set_rows` call. The pooled items are ordinary tree
+    items, so ``tree.item(iid, "values")`` lookups such as the copy menu in
+    :meth:`BaseFrame.attach_tree_copy_menu` keep working.
+    """
+
+    DEFAULT_ROW_HEIGHT = 20
+    WHEEL_STEP = 3
+
+    def __init__(
+        self,
+        tree: ttk.Treeview,
+        scrollbar: ttk.Scrollbar,
+        formatter: Callable[[Any], Tuple[Any, ...]],
+    ) -> None:
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.formatter = formatter
+        self._rows: List[Any] = []
+        self._pool: List[str] = []
+        self._offset = 0
+        self._capacity = 1
+        self._selected: Optional[int] = None
+
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.bind("<Configure>", self._on_configure, add="+")
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        tree.bind("<MouseWheel>", self._on_wheel)
+        tree.bind("<Button-4>", self._on_wheel)
+        tree.bind("<Button-5>", self._on_wheel)
+        tree.bind("<Up>", lambda _: self._step_selection(-1))
+        tree.bind("<Down>", lambda _: self._step_selection(1))
+        tree.bind("<Prior>", lambda _: self._scroll(-self._capacity))
+        tree.bind("<Next>", lambda _: self._scroll(self._capacity))
+        tree.bind("<Home>", lambda _: self._scroll(-len(self._rows)))
+        tree.bind("<End>", lambda _: self._scroll(len(self._rows)))
+
+    def set_rows(self, rows: List[Any]) -> None:
+        with METRICS.timer("tracking_ui_render_seconds", view="table"):
+            self._rows = rows
+            self._offset = 0
+            self._selected = None
+            self._render()
+
+    def _row_height(self) -> int:
+        style = self.tree.cget("style") or "Treeview"
+        try:
+            return max(1, int(ttk.Style(self.tree).lookup(style, "rowheight")))
+        except (TypeError, ValueError, tk.TclError):
+            return self.DEFAULT_ROW_HEIGHT
+
+    def _on_configure(self, _: Optional[tk.Event] = None) -> None:
+        row_height = self._row_height()
+        header_height = row_height
+        if self._pool:
+            bbox = self.tree.bbox(self._pool[0])
+            if bbox:
+                header_height, row_height = bbox[1], max(1, bbox[3])
+        capacity = max(1, (self.tree.winfo_height() - header_height) // row_height)
+        if capacity != self._capacity:
+            self._capacity = capacity
+            self._render()
+
+    def _render(self) -> None:
+        total = len(self._rows)
+        self._offset = max(0, min(self._offset, total - self._capacity))
+        window = self._rows[self._offset:self._offset + self._capacity]
+        if window and not self._pool:
+            # Re-measure once real rows exist; the heading height is only
+            # known from the first item's bounding box.
+            self.tree.after_idle(self._on_configure)
+        while len(self._pool) < len(window):
+            self._pool.append(self.tree.insert("", "end"))
+        while len(self._pool) > len(window):
+            self.tree.delete(self._pool.pop())
+        for iid, item in zip(self._pool, window):
+            self.tree.item(iid, values=self.formatter(item))
+        if self._pool:
+            self.tree.yview_moveto(0)
+
+        selected = self._selected
+        if selected is not None and 0 <= selected - self._offset < len(self._pool):
+            iid = self._pool[selected - self._offset]
+            if self.tree.selection() != (iid,):
+                self.tree.selection_set(iid)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total <= len(self._pool):
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + len(self._pool)) / total)
+
+    def _on_select(self, _: tk.Event) -> None:
+        selection = self.tree.selection()
+        # Selections cleared by scrolling the row out of view keep the index.
+        if selection and selection[0] in self._pool:
+            self._selected = self._offset + self._pool.index(selection[0])
+
+    def _on_scrollbar(self, *args: str) -> None:
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * len(self._rows))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= self._capacity
+            self._offset += step
+        self._render()
+
+    def _scroll(self, delta: int) -> str:
+        self._offset += delta
+        self._render()
+        return "break"
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        if event.num == 4:
+            return self._scroll(-self.WHEEL_STEP)
+        if event.num == 5:
+            return self._scroll(self.WHEEL_STEP)
+        return self._scroll(-self.WHEEL_STEP if event.delta > 0 else self.WHEEL_STEP)
+
+    def _step_selection(self, step: int) -> str:
+        if not self._rows:
+            return "break"
+        if self._selected is None:
+            index = self._offset
+        else:
+            index = max(0, min(len(self._rows) - 1, self._selected + step))
+        self._selected = index
+        if index < self._offset:
+            self._offset = index
+        elif index >= self._offset + self._capacity:
+            self._offset = index - self._capacity + 1
+        self._render()
+        if 0 <= index - self._offset < len(self._pool):
+            self.tree.focus(self._pool[index - self._offset])
+        return "break"
+
+
+class TaskPriority(IntEnum):
+    """Queue order of :class:`TaskExecutor` tasks; lower values run first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+class TaskExecutor:
+    """Bounded pool of reusable worker threads fed from one priority queue.
+
+    Threads are started on demand up to ``max_workers`` and then kept, so a
+    user action no longer costs a thread of its own. Queued tasks run by
+    :class:`TaskPriority`, first in first out within a priority. ``_idle``
+    counts workers that finished a task and were not yet claimed by a later
+    :meth:`submit`; each submission claims one or starts a thread.
+    """
+
+    def __init__(self, max_workers: int, name: str) -> None:
+        self.max_workers = max_workers
+        self.name = name
+        self._queue: "queue.PriorityQueue[Tuple[int, int, Callable[[], None]]]" = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+
+    def submit(self, fn: Callable[[], None], priority: TaskPriority = TaskPriority.NORMAL) -> None:
+        self._queue.put((int(priority), next(self._order), fn))
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+                return
+            if len(self._threads) >= self.max_workers:
+                return
+            thread = threading.Thread(
+                target=self._run, name=f"{self.name}-{len(self._threads) + 1}", daemon=True
+            )
+            self._threads.append(thread)
+        thread.start()
+
+    def _run(self) -> None:
+        # A new thread was started for the submission that spawned it, so it
+        # only counts as idle once its first task is done.
+        while True:
+            _, _, fn = self._queue.get()
+            try:
+                fn()
+            except Exception:  # noqa: BLE001 - keep the worker alive
+                sys.excepthook(*sys.exc_info())
+            with self._lock:
+                self._idle += 1
+
+
+class UiDispatcher:
+    """Single queue of callbacks that worker threads hand to the Tk main loop.
+
+    Workers :meth:`post` instead of calling ``widget.after(0, ...)``. The root
+    window drains the queue every ``UI_DISPATCH_INTERVAL_MS`` and runs all
+    pending callbacks in one pass, so a burst of results costs one timer tick
+    instead of one Tcl event each.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Deque[Callable[[], None]] = deque()
+        self._root: Optional[tk.Tk] = None
+
+    def attach(self, root: tk.Tk) -> None:
+        self._root = root
+        root.after(UI_DISPATCH_INTERVAL_MS, self._drain)
+
+    def post(self, callback: Callable[[], None]) -> None:
+        self._pending.append(callback)
+
+    def _drain(self) -> None:
+        root = self._root
+        if root is None:
+            return
+        try:
+            # Rescheduled first so callbacks that open modal dialogs keep the
+            # queue draining inside the dialog's event loop.
+            root.after(UI_DISPATCH_INTERVAL_MS, self._drain)
+        except tk.TclError:
+            self._root = None
+            return
+        METRICS.set_gauge("tracking_ui_dispatch_backlog", len(self._pending))
+        for _ in range(len(self._pending)):
+            try:
+                callback = self._pending.popleft()
+            except IndexError:
+                break
+            try:
+                callback()
+            except Exception:  # noqa: BLE001 - report like any other Tk callback
+                root.report_callback_exception(*sys.exc_info())
 
-    def _close(self) -> None:
-        self._cancelled = True
-        self.destroy()
 
-    def show(self) -> Optional[dtime]:
-        self.wait_window()
-        if self._cancelled:
-            return self._initial
-        return self.result
+TASKS = TaskExecutor(TK_WORKER_THREADS, "tk-worker")
+UI_QUEUE = UiDispatcher()
 
 
 class BaseFrame(tk.Frame):
     """Base frame that keeps every view consistent with the app brand."""
 
+    # Frames that TrackingApp keeps in its frame cache between navigations.
+    cacheable = False
+
     def __init__(self, app: "TrackingApp", *, background: str = PRIMARY_BG) -> None:
         super().__init__(app, bg=background, highlightthickness=0)
         self.app = app
         self.pack_propagate(False)
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
+        self._filter_after_id: Optional[str] = None
+        self._revalidated_at = time.monotonic()
+
+    def on_show(self) -> None:
+        """Called when a cached frame is shown again.
+
+        The cached rows stay on screen while :meth:`refresh_data` reloads them
+        in the background (stale-while-revalidate); re-showing the frame within
+        ``FRAME_REVALIDATE_SECONDS`` of the last refresh skips the request.
+        """
+
+        now = time.monotonic()
+        if now - self._revalidated_at >= FRAME_REVALIDATE_SECONDS:
+            self._revalidated_at = now
+            self.refresh_data()
+
+    def refresh_data(self) -> None:
+        """Reload the frame's data in the background; implemented by data frames."""
+
+    def set_online_state(self, online: bool) -> None:
+        """Show an app-wide connectivity change; implemented by frames that display it."""
+
+    def report_load_error(self, message: str, stale_var: tk.StringVar, *, quiet: bool) -> None:
+        """Show a failed load: an error dialog, or only a stale-data line when ``quiet``.
+
+        Background revalidation over rows already on screen is quiet; explicit
+        refreshes and loads without cached data still show the dialog.
+        """
+
+        if quiet:
+            stale_var.set(f"⚠️ Дані можуть бути застарілими. {message}")
+        else:
+            messagebox.showerror("Помилка", message)
+
+    def apply_filters(self) -> None:
+        """Re-filter the frame's records; implemented by frames with filters."""
+
+    def schedule_filters(self) -> None:
+        """Run :meth:`apply_filters` once typing pauses for ``FILTER_DEBOUNCE_MS``."""
+
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(FILTER_DEBOUNCE_MS, self._run_scheduled_filters)
+
+    def _run_scheduled_filters(self) -> None:
+        self._filter_after_id = None
+        self.apply_filters()
+
+    def _add_filter_entry(self, parent: tk.Widget, label: str, variable: tk.StringVar, column: int) -> None:
+        frame = tk.Frame(parent, bg=CARD_BG)
+        frame.grid(row=0, column=column, padx=6)
+        tk.Label(
+            frame,
+            text=label,
+            font=("Segoe UI", 11, "bold"),
+            fg=TEXT_SECONDARY,
+            bg=CARD_BG,
+        ).grid(row=0, column=0, sticky="w")
+        entry = ttk.Entry(frame, textvariable=variable, width=18)
+        entry.grid(row=1, column=0, pady=(6, 0))
+        entry.bind("<KeyRelease>", lambda _: self.schedule_filters())
+
+    def run_search(self, search: SearchPass, show: Callable[[List[TrackingRecord]], None]) -> None:
+        """Run ``search`` off the UI thread and pass the result to ``show`` if still current."""
+
+        if search.criteria.is_empty:
+            result = search.run()
+            if search.commit(result):
+                show(result or [])
+            return
+
+        def worker() -> None:
+            result = search.run()
+            if result is None:
+                return
+
+            def deliver() -> None:
+                if search.commit(result):
+                    show(result)
+
+            UI_QUEUE.post(deliver)
+
+        TASKS.submit(worker, TaskPriority.NORMAL)
 
     def perform_logout(self) -> None:
         if not messagebox.askyesno("Підтвердження", "Вийти з акаунту?"):
             return
         self.app.state_data = AppState()
         self.app.state_data.save()
+        OfflineQueue.stop_sync()
+        HISTORY_CACHE.reset()
+        ERRORS_CACHE.reset()
         self.app.show_login()
     def attach_tree_copy_menu(self, tree: ttk.Treeview) -> None:
         """Добавляет контекстное меню копирования для указанного Treeview."""
@@ -919,6 +3492,14 @@ class TrackingApp(tk.Tk):
 
         self.state_data = AppState.load()
         self._current_frame: Optional[tk.Frame] = None
+        self._frames: Dict[type, BaseFrame] = {}
+        self.is_online: Optional[bool] = CONNECTIVITY.online
+        CONNECTIVITY.add_listener(self._on_connectivity_change)
+        CONNECTIVITY.start()
+
+        UI_QUEUE.attach(self)
+        UI_WATCHDOG.start()
+        self.after(UI_HEARTBEAT_MS, self._heartbeat)
 
         self.style = ttk.Style(self)
         self._setup_styles()
@@ -930,6 +3511,10 @@ class TrackingApp(tk.Tk):
         else:
             self.show_login()
 
+    def _heartbeat(self) -> None:
+        UI_WATCHDOG.beat()
+        self.after(UI_HEARTBEAT_MS, self._heartbeat)
+
     def _setup_styles(self) -> None:
         try:
             self.style.theme_use("clam")
@@ -1014,11 +3599,58 @@ class TrackingApp(tk.Tk):
         )
 
     def switch_to(self, frame_cls: type[tk.Frame]) -> None:
-        if self._current_frame is not None:
-            self._current_frame.destroy()
+        """Show ``frame_cls``, reusing its cached instance when there is one.
+
+        Cacheable frames are hidden rather than destroyed and kept in
+        least-recently-shown order, up to ``FRAME_CACHE_SIZE``. Showing a
+        frame that is not cacheable (login, user name) drops the whole cache
+        so no view outlives the session it was built for.
+        """
+
+        current = self._current_frame
+        if not getattr(frame_cls, "cacheable", False):
+            self.clear_frame_cache()
+        if current is not None and current.winfo_exists():
+            if self._frames.get(type(current)) is current:
+                current.grid_remove()
+            else:
+                current.destroy()
+        frame = self._frames.pop(frame_cls, None)
+        if frame is not None and frame.winfo_exists():
+            self._frames[frame_cls] = frame
+            frame.grid()
+            self._current_frame = frame
+            frame.on_show()
+            return
         frame = frame_cls(self)
         frame.grid(row=0, column=0, sticky="nsew")
         self._current_frame = frame
+        if getattr(frame, "cacheable", False):
+            self._frames[frame_cls] = frame
+            while len(self._frames) > FRAME_CACHE_SIZE:
+                evicted = self._frames.pop(next(iter(self._frames)))
+                evicted.destroy()
+
+    def _on_connectivity_change(self, online: bool) -> None:
+        if online and self.state_data.token:
+            OfflineQueue.sync_pending(self.state_data.token, urgent=True)
+        UI_QUEUE.post(lambda: self._publish_connectivity(online))
+
+    def _publish_connectivity(self, online: bool) -> None:
+        """Pass a connectivity change to the shown frame and every cached one."""
+
+        self.is_online = online
+        frames = list(self._frames.values())
+        if self._current_frame is not None and self._current_frame not in frames:
+            frames.append(self._current_frame)
+        for frame in frames:
+            if frame.winfo_exists():
+                frame.set_online_state(online)
+
+    def clear_frame_cache(self) -> None:
+        for frame in self._frames.values():
+            frame.destroy()
+        self._frames.clear()
 
     def show_login(self) -> None:
         self.switch_to(LoginFrame)
@@ -1335,7 +3967,7 @@ class LoginFrame(BaseFrame):
 
         def worker() -> None:
             try:
-                response = requests.post(
+                response = HttpTransport.post(
                     f"{API_BASE}/login",
                     json={"surname": surname, "password": password},
                     headers={
@@ -1362,13 +3994,13 @@ class LoginFrame(BaseFrame):
                         self.app.state_data.user_name = resolved_name
                         self.app.state_data.user_role = str(role_name or "viewer").lower()
                         self.app.state_data.save()
-                        OfflineQueue.sync_pending(token)
+                        OfflineQueue.sync_pending(token, urgent=True)
                         if resolved_name:
                             self.app.show_scanner()
                         else:
                             self.app.show_username()
 
-                    self.after(0, finalize)
+                    UI_QUEUE.post(finalize)
                     return
 
                 try:
@@ -1376,17 +4008,17 @@ class LoginFrame(BaseFrame):
                 except ValueError:
                     payload = None
                 message = UserApi._extract_message(payload, response.status_code)
-                self.after(0, lambda: self.login_error_var.set(message))
+                UI_QUEUE.post(lambda: self.login_error_var.set(message))
             except ApiException as exc:
-                self.after(0, lambda: self.login_error_var.set(exc.message))
+                UI_QUEUE.post(lambda: self.login_error_var.set(exc.message))
             except requests.RequestException:
-                self.after(0, lambda: self.login_error_var.set("Помилка підключення до сервера"))
+                UI_QUEUE.post(lambda: self.login_error_var.set("Помилка підключення до сервера"))
             finally:
-                self.after(0, lambda: self._set_login_loading(False))
+                UI_QUEUE.post(lambda: self._set_login_loading(False))
 
         self.login_error_var.set("")
         self._set_login_loading(True)
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def _set_register_loading(self, loading: bool) -> None:
         self.register_loading = loading
@@ -1422,28 +4054,26 @@ class LoginFrame(BaseFrame):
         def worker() -> None:
             try:
                 UserApi.register_user(surname, password)
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: self._on_registration_success(
                         "Заявку на реєстрацію надіслано. Дочекайтесь підтвердження адміністратора."
                     ),
                 )
             except ApiException as exc:
-                self.after(0, lambda: self._set_register_feedback(exc.message, False))
+                UI_QUEUE.post(lambda: self._set_register_feedback(exc.message, False))
             except requests.RequestException:
-                 self.after(
-                    0,
+                 UI_QUEUE.post(
                     lambda: self._set_register_feedback(
                         "Не вдалося з’єднатися з сервером. Спробуйте пізніше.",
                         False,
                     ),
                 )
             finally:
-                self.after(0, lambda: self._set_register_loading(False))
+                UI_QUEUE.post(lambda: self._set_register_loading(False))
 
         self._set_register_feedback("", False)
         self._set_register_loading(True)
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def _on_registration_success(self, message: str) -> None:
         self._set_register_feedback(message, True)
@@ -1468,18 +4098,17 @@ class LoginFrame(BaseFrame):
                 def launch() -> None:
                     AdminPanelWindow(self.app, token)
 
-                self.after(0, launch)
+                UI_QUEUE.post(launch)
             except ApiException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", exc.message))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", exc.message))
             except requests.RequestException:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: messagebox.showerror(
                         "Помилка", "Не вдалося з’єднатися з сервером"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
 
 class AdminPanelWindow(tk.Toplevel):
@@ -1756,15 +4385,15 @@ class AdminPanelWindow(tk.Toplevel):
                 pending = UserApi.fetch_pending_users(self.admin_token)
                 users = UserApi.fetch_users(self.admin_token)
                 passwords = UserApi.fetch_role_passwords(self.admin_token)
-                self.after(0, lambda: self._apply_admin_data(pending, users, passwords))
+                UI_QUEUE.post(lambda: self._apply_admin_data(pending, users, passwords))
             except ApiException as exc:
-                self.after(0, lambda: self.status_var.set(f"Помилка: {exc.message}"))
+                UI_QUEUE.post(lambda: self.status_var.set(f"Помилка: {exc.message}"))
             except requests.RequestException:
-                self.after(0, lambda: self.status_var.set("Помилка зв’язку з сервером"))
+                UI_QUEUE.post(lambda: self.status_var.set("Помилка зв’язку з сервером"))
             finally:
-                self.after(0, lambda: setattr(self, "loading", False))
+                UI_QUEUE.post(lambda: setattr(self, "loading", False))
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.NORMAL)
 
     def _apply_admin_data(
         self,
@@ -1874,19 +4503,18 @@ class AdminPanelWindow(tk.Toplevel):
         def worker() -> None:
             try:
                 UserApi.approve_pending_user(self.admin_token, user.id, role)
-                self.after(0, lambda: self.status_var.set("Запит підтверджено"))
-                self.after(0, self.refresh_data)
+                UI_QUEUE.post(lambda: self.status_var.set("Запит підтверджено"))
+                UI_QUEUE.post(self.refresh_data)
             except ApiException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", exc.message))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", exc.message))
             except requests.RequestException:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: messagebox.showerror(
                         "Помилка", "Не вдалося з’єднатися з сервером"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def reject_selected(self) -> None:
         if self.loading:
@@ -1905,19 +4533,18 @@ class AdminPanelWindow(tk.Toplevel):
         def worker() -> None:
             try:
                 UserApi.reject_pending_user(self.admin_token, user.id)
-                self.after(0, lambda: self.status_var.set("Запит відхилено"))
-                self.after(0, self.refresh_data)
+                UI_QUEUE.post(lambda: self.status_var.set("Запит відхилено"))
+                UI_QUEUE.post(self.refresh_data)
             except ApiException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", exc.message))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", exc.message))
             except requests.RequestException:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: messagebox.showerror(
                         "Помилка", "Не вдалося з’єднатися з сервером"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def _get_selected_user(self) -> Optional[ManagedUser]:
         item_id = self.users_tree.focus()
@@ -1948,19 +4575,18 @@ class AdminPanelWindow(tk.Toplevel):
         def worker() -> None:
             try:
                 UserApi.update_user(self.admin_token, user.id, role=role)
-                self.after(0, lambda: self.status_var.set("Роль оновлено"))
-                self.after(0, self.refresh_data)
+                UI_QUEUE.post(lambda: self.status_var.set("Роль оновлено"))
+                UI_QUEUE.post(self.refresh_data)
             except ApiException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", exc.message))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", exc.message))
             except requests.RequestException:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: messagebox.showerror(
                         "Помилка", "Не вдалося з’єднатися з сервером"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def toggle_user_active(self) -> None:
         if self.loading:
@@ -1984,19 +4610,18 @@ class AdminPanelWindow(tk.Toplevel):
                     is_active=new_state,
                 )
                 state_text = "активовано" if new_state else "призупинено"
-                self.after(0, lambda: self.status_var.set(f"Користувача {state_text}"))
-                self.after(0, self.refresh_data)
+                UI_QUEUE.post(lambda: self.status_var.set(f"Користувача {state_text}"))
+                UI_QUEUE.post(self.refresh_data)
             except ApiException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", exc.message))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", exc.message))
             except requests.RequestException:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: messagebox.showerror(
                         "Помилка", "Не вдалося з’єднатися з сервером"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def delete_user(self) -> None:
         if self.loading:
@@ -2013,19 +4638,18 @@ class AdminPanelWindow(tk.Toplevel):
         def worker() -> None:
             try:
                 UserApi.delete_user(self.admin_token, user.id)
-                self.after(0, lambda: self.status_var.set("Користувача видалено"))
-                self.after(0, self.refresh_data)
+                UI_QUEUE.post(lambda: self.status_var.set("Користувача видалено"))
+                UI_QUEUE.post(self.refresh_data)
             except ApiException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", exc.message))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", exc.message))
             except requests.RequestException:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: messagebox.showerror(
                         "Помилка", "Не вдалося з’єднатися з сервером"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def update_role_password(self) -> None:
         if self.loading:
@@ -2053,19 +4677,52 @@ class AdminPanelWindow(tk.Toplevel):
                     role,
                     new_password.strip(),
                 )
-                self.after(0, lambda: self.status_var.set("Пароль оновлено"))
-                self.after(0, self.refresh_data)
+                UI_QUEUE.post(lambda: self.status_var.set("Пароль оновлено"))
+                UI_QUEUE.post(self.refresh_data)
             except ApiException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", exc.message))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", exc.message))
             except requests.RequestException:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: messagebox.showerror(
                         "Помилка", "Не вдалося з’єднатися з сервером"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Live summary of the scan timings collected in :data:`SCAN_METRICS`."""
+
+    def __init__(self, app: TrackingApp) -> None:
+        super().__init__(app)
+        self.title("Діагностика сканування")
+        self.configure(bg=CARD_BG)
+        self.geometry("760x420")
+        self.report_var = tk.StringVar()
+        tk.Label(
+            self,
+            textvariable=self.report_var,
+            font=("Consolas", 12),
+            fg=TEXT_PRIMARY,
+            bg=CARD_BG,
+            justify="left",
+            anchor="nw",
+            padx=24,
+            pady=24,
+        ).pack(fill="both", expand=True)
+        self._after_id: Optional[str] = None
+        self.protocol("WM_DELETE_WINDOW", self._close)
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self.report_var.set("\n".join(SCAN_METRICS.report_lines()))
+        self._after_id = self.after(DIAGNOSTICS_REFRESH_MS, self._refresh)
+
+    def _close(self) -> None:
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self.destroy()
 
 
 class UserNameFrame(BaseFrame):
@@ -2158,13 +4815,17 @@ class UserNameFrame(BaseFrame):
 
 
 class ScannerFrame(BaseFrame):
+    cacheable = True
+
     def __init__(self, app: TrackingApp) -> None:
         super().__init__(app)
         self.box_var = tk.StringVar()
         self.ttn_var = tk.StringVar()
         self.status_var = tk.StringVar(value="Готово до введення BoxID")
+        self.sync_var = tk.StringVar(value="")
         self.online_var = tk.StringVar(value="Перевірка зв’язку...")
         self.online_color = "#facc15"
+        self.is_online = False
         self.step_progress_var = tk.StringVar(value="Крок 1 з 2")
         self.step_title_var = tk.StringVar(value="Введіть BoxID")
 
@@ -2262,6 +4923,13 @@ class ScannerFrame(BaseFrame):
             style="Secondary.TButton",
         ).grid(row=0, column=column, padx=6)
         column += 1
+        ttk.Button(
+            nav,
+            text="Діагностика",
+            command=self.open_diagnostics,
+            style="Secondary.TButton",
+        ).grid(row=0, column=column, padx=6)
+        column += 1
         ttk.Button(
             nav,
             text="Вийти",
@@ -2346,10 +5014,62 @@ class ScannerFrame(BaseFrame):
             wraplength=1200,
             justify="center",
         ).grid(row=0, column=0, sticky="ew")
+        sync_row = tk.Frame(status_panel, bg="#f8fafc")
+        sync_row.grid(row=1, column=0, pady=(8, 0))
+        tk.Label(
+            sync_row,
+            textvariable=self.sync_var,
+            font=("Segoe UI", 11),
+            fg=TEXT_SECONDARY,
+            bg="#f8fafc",
+            wraplength=1000,
+            justify="center",
+        ).grid(row=0, column=0)
+        self.retry_parked_button = ttk.Button(
+            sync_row,
+            text="Надіслати відхилені повторно",
+            style="Secondary.TButton",
+            command=self.retry_parked,
+        )
+        self.retry_parked_button.grid(row=0, column=1, padx=(12, 0))
+        self.retry_parked_button.grid_remove()
+
+        recent_panel = tk.Frame(card, bg=CARD_BG)
+        recent_panel.grid(row=5, column=0, sticky="ew", pady=(24, 0))
+        recent_panel.columnconfigure(0, weight=1)
+        tk.Label(
+            recent_panel,
+            text="Останні сканування",
+            font=("Segoe UI", 12, "bold"),
+            fg=TEXT_SECONDARY,
+            bg=CARD_BG,
+        ).grid(row=0, column=0, sticky="w")
+        self.recent_tree = ttk.Treeview(
+            recent_panel,
+            columns=("time", "boxid", "ttn", "status"),
+            show="headings",
+            height=RECENT_SCANS_LIMIT,
+            selectmode="none",
+        )
+        for column, title, width in (
+            ("time", "Час", 120),
+            ("boxid", "BoxID", 220),
+            ("ttn", "ТТН", 220),
+            ("status", "Статус", 420),
+        ):
+            self.recent_tree.heading(column, text=title)
+            self.recent_tree.column(column, width=width, anchor="w", stretch=column == "status")
+        self.recent_tree.grid(row=1, column=0, sticky="ew", pady=(8, 0))
+        self._last_key: Optional[str] = None
+        OfflineQueue.add_outcome_listener(self._on_scan_outcome)
+        OfflineQueue.worker().add_listener(self._on_sync_pass)
+        self.bind("<Destroy>", lambda _: self._detach_sync_listeners())
+        TASKS.submit(lambda: self._on_sync_pass(0), TaskPriority.BACKGROUND)
 
         self.stage = "box"
         self.box_entry.focus_set()
-        self.check_connectivity()
+        if self.app.is_online is not None:
+            self.set_online_state(self.app.is_online)
         OfflineQueue.sync_pending(self.app.state_data.token or "")
 
     def _create_input_group(
@@ -2375,6 +5095,7 @@ class ScannerFrame(BaseFrame):
         return frame, entry
 
     def set_online_state(self, online: bool) -> None:
+        self.is_online = online
         if online:
             self.online_color = "#16a34a"
             self.online_var.set("🟢 Підключення активне")
@@ -2385,18 +5106,6 @@ class ScannerFrame(BaseFrame):
             fg = "white"
         self.online_chip.configure(bg=self.online_color, fg=fg)
 
-    def check_connectivity(self) -> None:
-        def worker() -> None:
-            try:
-                response = requests.head(API_BASE, timeout=5)
-                online = response.status_code < 500
-            except requests.RequestException:
-                online = False
-            self.after(0, lambda: self.set_online_state(online))
-            self.after(15000, self.check_connectivity)
-
-        threading.Thread(target=worker, daemon=True).start()
-
     def to_next(self) -> None:
         if self.stage != "box":
             return
@@ -2412,6 +5121,13 @@ class ScannerFrame(BaseFrame):
         self.primary_button.configure(text="Зберегти запис", command=self.submit)
         self.ttn_entry.focus_set()
 
+    def on_show(self) -> None:
+        super().on_show()
+        (self.box_entry if self.stage == "box" else self.ttn_entry).focus_set()
+
+    def refresh_data(self) -> None:
+        OfflineQueue.sync_pending(self.app.state_data.token or "")
+
     def reset_fields(self) -> None:
         self.box_var.set("")
         self.ttn_var.set("")
@@ -2436,51 +5152,73 @@ class ScannerFrame(BaseFrame):
             "boxid": boxid,
             "ttn": ttn,
         }
-        self.status_var.set("Відправлення даних...")
-        self.primary_button.configure(text="Відправлення...", state="disabled")
+        key = OfflineQueue.new_key()
+        token = self.app.state_data.token or ""
+        SCAN_METRICS.scan_started(key, record["user_name"] or UNKNOWN_USER_NAME)
+        # Local-first: the scan is in the outbox before the form is cleared;
+        # the upload runs on the sync worker and reports back into the
+        # recent-scans strip.
+        try:
+            OfflineQueue.add_record(record, key)
+        except (OSError, sqlite3.Error) as exc:
+            messagebox.showerror("Помилка", f"Не вдалося зберегти запис: {exc}")
+            return
+        SCAN_METRICS.scan_committed(key)
+        self.reset_fields()
+        self._last_key = key
+        self.recent_tree.insert(
+            "",
+            0,
+            iid=key,
+            values=(datetime.now().strftime("%H:%M:%S"), boxid, ttn, "⏳ Надсилання..."),
+        )
+        for stale in self.recent_tree.get_children()[RECENT_SCANS_LIMIT:]:
+            self.recent_tree.delete(stale)
+        self.status_var.set("⏳ Запис збережено, надсилання...")
+        if token:
+            OfflineQueue.sync_pending(token)
+        else:
+            SCAN_METRICS.scan_finished(key, online=False)
+            self._show_scan_outcome(key, "📦 Збережено локально. Увійдіть знову, щоб синхронізувати.")
+
+    def _on_scan_outcome(self, key: str, outcome: str, detail: str) -> None:
+        message = OfflineQueue.describe_outcome(outcome, detail)
+        UI_QUEUE.post(lambda: self._show_scan_outcome(key, message))
+
+    def _show_scan_outcome(self, key: str, message: str) -> None:
+        if not self.winfo_exists():
+            return
+        if self.recent_tree.exists(key):
+            self.recent_tree.set(key, "status", message)
+        if key == self._last_key:
+            self.status_var.set(message)
+
+    def _detach_sync_listeners(self) -> None:
+        OfflineQueue.remove_outcome_listener(self._on_scan_outcome)
+        OfflineQueue.worker().remove_listener(self._on_sync_pass)
+
+    def _on_sync_pass(self, cleared: int) -> None:
+        text, parked = OfflineQueue.sync_summary(cleared)
+        UI_QUEUE.post(lambda: self._show_sync_summary(text, parked))
+
+    def _show_sync_summary(self, text: str, parked: int) -> None:
+        if not self.winfo_exists():
+            return
+        self.sync_var.set(text)
+        if parked:
+            self.retry_parked_button.grid()
+        else:
+            self.retry_parked_button.grid_remove()
+
+    def retry_parked(self) -> None:
+        token = self.app.state_data.token or ""
+        self.retry_parked_button.grid_remove()
 
         def worker() -> None:
-            token = self.app.state_data.token or ""
-            if not token:
-                OfflineQueue.add_record(record)
-                self.after(
-                    0,
-                    lambda: self.status_var.set(
-                        "📦 Збережено локально. Увійдіть знову, щоб синхронізувати."
-                    ),
-                )
-                self.after(0, self.reset_fields)
-                return
-            try:
-                response = requests.post(
-                    f"{API_BASE}/add_record",
-                    json=record,
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=10,
-                )
-                if response.status_code == 200:
-                    note = response.json().get("note", "")
-                    if note:
-                        message = f"⚠️ Дублікат: {note}"
-                    else:
-                        message = "✅ Успішно додано"
-                    self.after(0, lambda: self.status_var.set(message))
-                    self.after(0, lambda: self.set_online_state(True))
-                else:
-                    raise requests.RequestException(f"status {response.status_code}")
-            except requests.RequestException:
-                OfflineQueue.add_record(record)
-                self.after(0, lambda: self.status_var.set("📦 Збережено локально (офлайн)"))
-                self.after(0, lambda: self.set_online_state(False))
-            finally:
-                self.after(0, self.reset_fields)
-                self.after(0, lambda: self.primary_button.configure(state="normal"))
-                OfflineQueue.sync_pending(token)
+            OfflineQueue.retry_parked(token)
+            self._on_sync_pass(0)
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def logout(self) -> None:
         self.perform_logout()
@@ -2494,8 +5232,13 @@ class ScannerFrame(BaseFrame):
     def open_statistics(self) -> None:
         self.app.show_statistics()
 
+    def open_diagnostics(self) -> None:
+        DiagnosticsWindow(self.app)
+
 
 class HistoryFrame(BaseFrame):
+    cacheable = True
+
     def __init__(self, app: TrackingApp) -> None:
         super().__init__(app)
         self.role_info = get_role_info(app.state_data.user_role, app.state_data.access_level)
@@ -2643,6 +5386,8 @@ class HistoryFrame(BaseFrame):
         ttk.Label(status, textvariable=self.date_display, style="Card.TLabel").grid(row=0, column=0, padx=(0, 24))
         ttk.Label(status, textvariable=self.start_display, style="Card.TLabel").grid(row=0, column=1, padx=(0, 24))
         ttk.Label(status, textvariable=self.end_display, style="Card.TLabel").grid(row=0, column=2)
+        self.stale_var = tk.StringVar()
+        ttk.Label(status, textvariable=self.stale_var, style="Card.TLabel").grid(row=0, column=3, padx=(24, 0))
 
         tree_container = tk.Frame(card, bg=CARD_BG)
         tree_container.grid(row=3, column=0, sticky="nsew", pady=(24, 0))
@@ -2662,34 +5407,25 @@ class HistoryFrame(BaseFrame):
             self.tree.heading(col, text=text)
             self.tree.column(col, width=200 if col == "datetime" else 160, anchor="center")
 
-        vsb = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
+        vsb = ttk.Scrollbar(tree_container, orient="vertical")
         hsb = ttk.Scrollbar(tree_container, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(xscrollcommand=hsb.set)
         self.tree.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
-        
+        self.table = VirtualTreeview(self.tree, vsb, self._row_values)
+
         self.attach_tree_copy_menu(self.tree)
 
 
-        self.records: List[Dict[str, Any]] = []
-        self.filtered: List[Dict[str, Any]] = []
+        self.records: List[TrackingRecord] = []
+        self.filtered: List[TrackingRecord] = []
+        self._search = RecordSearch(HISTORY_CACHE.index)
 
         self.fetch_history()
 
-    def _add_filter_entry(self, parent: tk.Widget, label: str, variable: tk.StringVar, column: int) -> None:
-        frame = tk.Frame(parent, bg=CARD_BG)
-        frame.grid(row=0, column=column, padx=6)
-        tk.Label(
-            frame,
-            text=label,
-            font=("Segoe UI", 11, "bold"),
-            fg=TEXT_SECONDARY,
-            bg=CARD_BG,
-        ).grid(row=0, column=0, sticky="w")
-        entry = ttk.Entry(frame, textvariable=variable, width=18)
-        entry.grid(row=1, column=0, pady=(6, 0))
-        entry.bind("<KeyRelease>", lambda _: self.apply_filters())
+    def refresh_data(self) -> None:
+        self.fetch_history(TaskPriority.BACKGROUND)
 
     def pick_date(self) -> None:
         picker = DatePickerDialog(self, initial=self.date_filter)
@@ -2735,80 +5471,52 @@ class HistoryFrame(BaseFrame):
         self.end_display.set("Кінець: —")
         self.apply_filters()
 
-    def fetch_history(self) -> None:
+    def fetch_history(self, priority: TaskPriority = TaskPriority.NORMAL) -> None:
         token = self.app.state_data.token
         if not token:
             messagebox.showerror("Помилка", "Необхідна авторизація")
             return
 
+        quiet = priority == TaskPriority.BACKGROUND and bool(self.records)
+
         def worker() -> None:
             try:
-                response = requests.get(
-                    f"{API_BASE}/get_history",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    fallback = datetime.min.replace(tzinfo=timezone.utc)
-                    data.sort(
-                        key=lambda r: parse_api_datetime(r.get("datetime")) or fallback,
-                        reverse=True,
-                    )
-                    self.records = data
-                    self.after(0, self.apply_filters)
-                else:
-                    raise requests.RequestException(f"status {response.status_code}")
+                self.records = HISTORY_CACHE.sync(token)
+                UI_QUEUE.post(self._on_records_loaded)
             except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося завантажити історію: {exc}"))
+                message = f"Не вдалося завантажити історію: {exc}"
+                UI_QUEUE.post(lambda: self.report_load_error(message, self.stale_var, quiet=quiet))
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, priority)
+
+    def _on_records_loaded(self) -> None:
+        self.stale_var.set("")
+        self.apply_filters()
 
     def apply_filters(self) -> None:
-        filtered = list(self.records)
-        if self.box_filter.get():
-            needle = self.box_filter.get().strip().lower()
-            filtered = [r for r in filtered if needle in str(r.get("boxid", "")).lower()]
-        if self.ttn_filter.get():
-            needle = self.ttn_filter.get().strip().lower()
-            filtered = [r for r in filtered if needle in str(r.get("ttn", "")).lower()]
-        if self.user_filter.get():
-            needle = self.user_filter.get().strip().lower()
-            filtered = [r for r in filtered if needle in str(r.get("user_name", "")).lower()]
-
-        if self.date_filter or self.start_time or self.end_time:
-            timed: list[Dict[str, Any]] = []
-            for record in filtered:
-                dt = parse_api_datetime(record.get("datetime"))
-                if not dt:
-                    continue
-                if self.date_filter and dt.date() != self.date_filter:
-                    continue
-                tm = dt.time()
-                if self.start_time and tm < self.start_time:
-                    continue
-                if self.end_time and tm > self.end_time:
-                    continue
-                timed.append(record)
-            filtered = timed
+        criteria = RecordFilter.from_inputs(
+            self.box_filter.get(),
+            self.ttn_filter.get(),
+            self.user_filter.get(),
+            self.date_filter,
+            self.start_time,
+            self.end_time,
+        )
+        self.run_search(self._search.begin(self.records, criteria), self._show_filtered)
 
+    def _show_filtered(self, filtered: List[TrackingRecord]) -> None:
         self.filtered = filtered
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for item in filtered:
-            dt = parse_api_datetime(item.get("datetime"))
-            dt_txt = dt.strftime("%d.%m.%Y %H:%M:%S") if dt else item.get("datetime", "")
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    dt_txt,
-                    item.get("boxid", ""),
-                    item.get("ttn", ""),
-                    item.get("user_name", ""),
-                    item.get("note", ""),
-                ),
-            )
+        self.table.set_rows(filtered)
+
+    @staticmethod
+    def _row_values(item: TrackingRecord) -> Tuple[Any, ...]:
+        return (
+            item.display_time,
+            item.get("boxid", ""),
+            item.get("ttn", ""),
+            item.get("user_name", ""),
+            item.get("note", ""),
+        )
 
     def clear_history(self) -> None:
         if not messagebox.askyesno("Підтвердження", "Очистити історію? Це незворотньо."):
@@ -2819,29 +5527,33 @@ class HistoryFrame(BaseFrame):
 
         def worker() -> None:
             try:
-                response = requests.delete(
+                response = HttpTransport.delete(
                     f"{API_BASE}/clear_tracking",
                     headers={"Authorization": f"Bearer {token}"},
                     timeout=10,
                 )
                 if response.status_code == 200:
+                    HISTORY_CACHE.reset()
+
                     def update() -> None:
-                        self.records.clear()
+                        self.records = []
                         self.apply_filters()
 
-                    self.after(0, update)
+                    UI_QUEUE.post(update)
                 else:
                     raise requests.RequestException(f"status {response.status_code}")
             except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def logout(self) -> None:
         self.perform_logout()
 
 
 class StatisticsFrame(BaseFrame):
+    cacheable = True
+
     def __init__(self, app: TrackingApp) -> None:
         super().__init__(app)
         self.role_info = get_role_info(app.state_data.user_role, app.state_data.access_level)
@@ -2850,11 +5562,12 @@ class StatisticsFrame(BaseFrame):
         )
         if not self.is_admin:
             messagebox.showerror("Обмежено", "Статистика доступна лише адміністратору.")
-            self.after(0, self.app.show_scanner)
+            self.cacheable = False
+            UI_QUEUE.post(self.app.show_scanner)
             return
 
-        self.history_records: List[Dict[str, Any]] = []
-        self.error_records: List[Dict[str, Any]] = []
+        self.history_records: List[TrackingRecord] = []
+        self.error_records: List[TrackingRecord] = []
         today = date.today()
         self.start_date: Optional[date] = today.replace(day=1)
         self.start_time: Optional[dtime] = dtime.min
@@ -3126,6 +5839,9 @@ class StatisticsFrame(BaseFrame):
         self._update_period_label()
         self.fetch_data()
 
+    def refresh_data(self) -> None:
+        self.fetch_data(TaskPriority.BACKGROUND)
+
     def _create_metric(self, parent: tk.Frame, column: int, title: str, variable: tk.StringVar) -> None:
         container = tk.Frame(
             parent,
@@ -3272,7 +5988,7 @@ class StatisticsFrame(BaseFrame):
             text = "Період: Усі дані"
         self.period_var.set(text)
 
-    def fetch_data(self) -> None:
+    def fetch_data(self, priority: TaskPriority = TaskPriority.NORMAL) -> None:
         token = self.app.state_data.token
         if not token:
             messagebox.showerror("Помилка", "Необхідна авторизація для перегляду статистики")
@@ -3281,162 +5997,78 @@ class StatisticsFrame(BaseFrame):
 
         def worker() -> None:
             try:
-                headers = {"Authorization": f"Bearer {token}"}
-                history_resp = requests.get(
-                    f"{API_BASE}/get_history",
-                    headers=headers,
-                    timeout=10,
-                )
-                errors_resp = requests.get(
-                    f"{API_BASE}/get_errors",
-                    headers=headers,
-                    timeout=10,
-                )
-                if history_resp.status_code == 200 and errors_resp.status_code == 200:
-                    history_data = history_resp.json()
-                    errors_data = errors_resp.json()
-                    fallback = datetime.min.replace(tzinfo=timezone.utc)
-                    history_data.sort(
-                        key=lambda r: parse_api_datetime(r.get("datetime")) or fallback,
-                        reverse=True,
-                    )
-                    errors_data.sort(
-                        key=lambda r: parse_api_datetime(r.get("datetime")) or fallback,
-                        reverse=True,
-                    )
-                    self.after(0, lambda: self._on_data_loaded(history_data, errors_data))
-                else:
-                    raise requests.RequestException(
-                        f"history {history_resp.status_code}, errors {errors_resp.status_code}"
-                    )
+                history_data = HISTORY_CACHE.sync(token)
+                errors_data = ERRORS_CACHE.sync(token)
+                UI_QUEUE.post(lambda: self._on_data_loaded(history_data, errors_data))
             except requests.RequestException as exc:
-                self.after(
-                    0,
+                UI_QUEUE.post(
                     lambda: self.status_var.set(
                         f"Помилка завантаження: {exc}"
                     ),
                 )
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, priority)
 
-    def _on_data_loaded(self, history: List[Dict[str, Any]], errors: List[Dict[str, Any]]) -> None:
+    def _on_data_loaded(self, history: List[TrackingRecord], errors: List[TrackingRecord]) -> None:
         self.history_records = history
         self.error_records = errors
         self.last_updated = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
         self.refresh_statistics()
 
-    @staticmethod
-    def _normalize(dt_value: Optional[datetime]) -> Optional[datetime]:
-        if dt_value and dt_value.tzinfo:
-            return dt_value.astimezone().replace(tzinfo=None)
-        return dt_value
-
-    def _filter_records(
-        self, records: List[Dict[str, Any]], start: Optional[datetime], end: Optional[datetime]
-    ) -> List[Dict[str, Any]]:
-        filtered: List[Dict[str, Any]] = []
-        for record in records:
-            dt_value = self._normalize(parse_api_datetime(record.get("datetime")))
-            if not dt_value:
-                continue
-            if start and dt_value < start:
-                continue
-            if end and dt_value > end:
-                continue
-            filtered.append(record)
-        return filtered
-
     def refresh_statistics(self) -> None:
-        start = self._start_datetime()
-        end = self._end_datetime()
-        scans = self._filter_records(self.history_records, start, end)
-        errors = self._filter_records(self.error_records, start, end)
-
-        scan_counts: Dict[str, int] = defaultdict(int)
-        for record in scans:
-            name = (record.get("user_name") or "Невідомий користувач").strip() or "Невідомий користувач"
-            scan_counts[name] += 1
-
-        error_counts: Dict[str, int] = defaultdict(int)
-        for record in errors:
-            name = (record.get("user_name") or "Невідомий користувач").strip() or "Невідомий користувач"
-            error_counts[name] += 1
-
-        self.scan_counts = dict(scan_counts)
-        self.error_counts = dict(error_counts)
-
-        self.total_scans_var.set(str(sum(self.scan_counts.values())))
-        self.unique_users_var.set(str(len(self.scan_counts)))
-        self.total_errors_var.set(str(sum(self.error_counts.values())))
-        self.error_users_var.set(str(len(self.error_counts)))
-
-        top_scan_name, top_scan_count = self._get_top_entry(self.scan_counts)
-        top_error_name, top_error_count = self._get_top_entry(self.error_counts)
-        self.top_operator_var.set(top_scan_name)
-        self.top_operator_count_var.set(str(top_scan_count))
-        self.top_error_operator_var.set(top_error_name)
-        self.top_error_count_var.set(str(top_error_count))
-
-        daily_map: Dict[date, Dict[str, Any]] = {}
-
-        def ensure_day(day: date) -> Dict[str, Any]:
-            if day not in daily_map:
-                daily_map[day] = {
-                    "scans": 0,
-                    "errors": 0,
-                    "scan_users": defaultdict(int),
-                    "error_users": defaultdict(int),
-                }
-            return daily_map[day]
-
-        for record in scans:
-            dt_value = self._normalize(parse_api_datetime(record.get("datetime")))
-            if not dt_value:
-                continue
-            info = ensure_day(dt_value.date())
-            name = (record.get("user_name") or "Невідомий користувач").strip() or "Невідомий користувач"
-            info["scans"] += 1
-            info["scan_users"][name] += 1
-
-        for record in errors:
-            dt_value = self._normalize(parse_api_datetime(record.get("datetime")))
-            if not dt_value:
-                continue
-            info = ensure_day(dt_value.date())
-            name = (record.get("user_name") or "Невідомий користувач").strip() or "Невідомий користувач"
-            info["errors"] += 1
-            info["error_users"][name] += 1
-
-        daily_rows: List[Tuple[str, int, int, str, str]] = []
-        for day, info in sorted(daily_map.items(), key=lambda item: item[0], reverse=True):
-            top_day_scan, top_day_scan_count = self._get_top_entry(info["scan_users"])
-            top_day_error, top_day_error_count = self._get_top_entry(info["error_users"])
-            daily_rows.append(
-                (
-                    day.strftime("%d.%m.%Y"),
-                    info["scans"],
-                    info["errors"],
-                    self._format_top_display(top_day_scan, top_day_scan_count),
-                    self._format_top_display(top_day_error, top_day_error_count),
+        with METRICS.timer("tracking_ui_render_seconds", view="statistics"):
+            start = self._start_datetime()
+            end = self._end_datetime()
+            scan_days = TimedRecords.of(self.history_records).day_counts(start, end)
+            error_days = TimedRecords.of(self.error_records).day_counts(start, end)
+
+            self.scan_counts = DayRollup.totals(scan_days.values())
+            self.error_counts = DayRollup.totals(error_days.values())
+
+            self.total_scans_var.set(str(sum(self.scan_counts.values())))
+            self.unique_users_var.set(str(len(self.scan_counts)))
+            self.total_errors_var.set(str(sum(self.error_counts.values())))
+            self.error_users_var.set(str(len(self.error_counts)))
+
+            top_scan_name, top_scan_count = self._get_top_entry(self.scan_counts)
+            top_error_name, top_error_count = self._get_top_entry(self.error_counts)
+            self.top_operator_var.set(top_scan_name)
+            self.top_operator_count_var.set(str(top_scan_count))
+            self.top_error_operator_var.set(top_error_name)
+            self.top_error_count_var.set(str(top_error_count))
+
+            daily_rows: List[Tuple[str, int, int, str, str]] = []
+            for day in sorted(scan_days.keys() | error_days.keys(), reverse=True):
+                scan_users = scan_days.get(day, {})
+                error_users = error_days.get(day, {})
+                top_day_scan, top_day_scan_count = self._get_top_entry(scan_users)
+                top_day_error, top_day_error_count = self._get_top_entry(error_users)
+                daily_rows.append(
+                    (
+                        day.strftime("%d.%m.%Y"),
+                        sum(scan_users.values()),
+                        sum(error_users.values()),
+                        self._format_top_display(top_day_scan, top_day_scan_count),
+                        self._format_top_display(top_day_error, top_day_error_count),
+                    )
                 )
-            )
 
-        self.daily_rows = daily_rows
+            self.daily_rows = daily_rows
 
-        self._populate_tree(self.scan_tree, self.scan_counts)
-        self._populate_tree(self.error_tree, self.error_counts)
-        self._populate_daily_tree(self.timeline_tree, daily_rows)
+            self._populate_tree(self.scan_tree, self.scan_counts)
+            self._populate_tree(self.error_tree, self.error_counts)
+            self._populate_daily_tree(self.timeline_tree, daily_rows)
 
-        if self.last_updated:
-            suffix = f" (оновлено {self.last_updated})"
-        else:
-            suffix = ""
-        leader_suffix = (
-            f" | Лідер: {top_scan_name} ({top_scan_count})" if top_scan_count else ""
-        )
-        self.status_var.set(
-            f"Відображено {self.total_scans_var.get()} сканувань та {self.total_errors_var.get()} помилок{suffix}{leader_suffix}"
-        )
+            if self.last_updated:
+                suffix = f" (оновлено {self.last_updated})"
+            else:
+                suffix = ""
+            leader_suffix = (
+                f" | Лідер: {top_scan_name} ({top_scan_count})" if top_scan_count else ""
+            )
+            self.status_var.set(
+                f"Відображено {self.total_scans_var.get()} сканувань та {self.total_errors_var.get()} помилок{suffix}{leader_suffix}"
+            )
 
     def _populate_tree(self, tree: ttk.Treeview, data: Dict[str, int]) -> None:
         for row in tree.get_children():
@@ -3540,6 +6172,8 @@ class StatisticsFrame(BaseFrame):
 
 
 class ErrorsFrame(BaseFrame):
+    cacheable = True
+
     def __init__(self, app: TrackingApp) -> None:
         super().__init__(app)
         self.role_info = get_role_info(app.state_data.user_role, app.state_data.access_level)
@@ -3648,11 +6282,23 @@ class ErrorsFrame(BaseFrame):
         toolbar = tk.Frame(card, bg=CARD_BG)
         toolbar.grid(row=2, column=0, sticky="ew")
         toolbar.columnconfigure(0, weight=1)
+        inputs = tk.Frame(toolbar, bg=CARD_BG)
+        inputs.grid(row=0, column=0, sticky="w")
+        self.box_filter = tk.StringVar()
+        self.ttn_filter = tk.StringVar()
+        self.user_filter = tk.StringVar()
+        self._add_filter_entry(inputs, "BoxID", self.box_filter, 0)
+        self._add_filter_entry(inputs, "TTN", self.ttn_filter, 1)
+        self._add_filter_entry(inputs, "Користувач", self.user_filter, 2)
         button_bar = tk.Frame(toolbar, bg=CARD_BG)
         button_bar.grid(row=0, column=1, sticky="e")
         ttk.Button(button_bar, text="Оновити", command=self.fetch_errors, style="Secondary.TButton").grid(row=0, column=0, padx=4)
         if self.role_info["can_clear_errors"]:
             ttk.Button(button_bar, text="Очистити всі", command=self.clear_errors, style="Secondary.TButton").grid(row=0, column=1, padx=4)
+        self.stale_var = tk.StringVar()
+        ttk.Label(toolbar, textvariable=self.stale_var, style="Card.TLabel").grid(
+            row=1, column=0, columnspan=2, sticky="w", pady=(8, 0)
+        )
 
         tree_container = tk.Frame(card, bg=CARD_BG)
         tree_container.grid(row=3, column=0, sticky="nsew", pady=(24, 0))
@@ -3685,65 +6331,69 @@ class ErrorsFrame(BaseFrame):
         if self.role_info["can_clear_errors"]:
             self.tree.bind("<Double-1>", self.delete_selected_error)
 
-        self.records: List[Dict[str, Any]] = []
+        self.records: List[TrackingRecord] = []
+        self.filtered: List[TrackingRecord] = []
+        self._search = RecordSearch(ERRORS_CACHE.index)
 
         self.fetch_errors()
 
-    def fetch_errors(self) -> None:
+    def refresh_data(self) -> None:
+        self.fetch_errors(TaskPriority.BACKGROUND)
+
+    def fetch_errors(self, priority: TaskPriority = TaskPriority.NORMAL) -> None:
         token = self.app.state_data.token
         if not token:
             messagebox.showerror("Помилка", "Необхідна авторизація")
             return
 
+        quiet = priority == TaskPriority.BACKGROUND and bool(self.records)
+
         def worker() -> None:
             try:
-                response = requests.get(
-                    f"{API_BASE}/get_errors",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    fallback = datetime.min.replace(tzinfo=timezone.utc)
-                    data.sort(
-                        key=lambda r: parse_api_datetime(r.get("datetime")) or fallback,
-                        reverse=True,
-                    )
-                    self.records = data
-                    self.after(0, self.render_records)
-                else:
-                    raise requests.RequestException(f"status {response.status_code}")
+                self.records = ERRORS_CACHE.sync(token)
+                UI_QUEUE.post(self._on_records_loaded)
             except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося завантажити: {exc}"))
-
-        threading.Thread(target=worker, daemon=True).start()
-
-    def render_records(self) -> None:
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for item in self.records:
-            dt = parse_api_datetime(item.get("datetime"))
-            dt_txt = dt.strftime("%d.%m.%Y %H:%M:%S") if dt else item.get("datetime", "")
-            reason = (
-                item.get("error_message")
-                or item.get("reason")
-                or item.get("note")
-                or item.get("message")
-                or item.get("error")
-                or "Причина не вказана"
-            )
-            self.tree.insert(
-                "",
-                "end",
-                iid=str(item.get("id", "")),
-                values=(
-                    dt_txt,
-                    item.get("boxid", ""),
-                    item.get("ttn", ""),
-                    item.get("user_name", ""),
-                    reason,
-                ),
-            )
+                message = f"Не вдалося завантажити: {exc}"
+                UI_QUEUE.post(lambda: self.report_load_error(message, self.stale_var, quiet=quiet))
+
+        TASKS.submit(worker, priority)
+
+    def _on_records_loaded(self) -> None:
+        self.stale_var.set("")
+        self.apply_filters()
+
+    def apply_filters(self) -> None:
+        criteria = RecordFilter.from_inputs(
+            self.box_filter.get(), self.ttn_filter.get(), self.user_filter.get(), None, None, None
+        )
+        self.run_search(self._search.begin(self.records, criteria), self.render_records)
+
+    def render_records(self, records: List[TrackingRecord]) -> None:
+        with METRICS.timer("tracking_ui_render_seconds", view="errors"):
+            self.filtered = records
+            for row in self.tree.get_children():
+                self.tree.delete(row)
+            for item in records:
+                reason = (
+                    item.get("error_message")
+                    or item.get("reason")
+                    or item.get("note")
+                    or item.get("message")
+                    or item.get("error")
+                    or "Причина не вказана"
+                )
+                self.tree.insert(
+                    "",
+                    "end",
+                    iid=str(item.get("id", "")),
+                    values=(
+                        item.display_time,
+                        item.get("boxid", ""),
+                        item.get("ttn", ""),
+                        item.get("user_name", ""),
+                        reason,
+                    ),
+                )
 
     def clear_errors(self) -> None:
         if not messagebox.askyesno("Підтвердження", "Очистити журнал помилок?"):
@@ -3754,23 +6404,25 @@ class ErrorsFrame(BaseFrame):
 
         def worker() -> None:
             try:
-                response = requests.delete(
+                response = HttpTransport.delete(
                     f"{API_BASE}/clear_errors",
                     headers={"Authorization": f"Bearer {token}"},
                     timeout=10,
                 )
                 if response.status_code == 200:
+                    ERRORS_CACHE.reset()
+
                     def update() -> None:
-                        self.records.clear()
-                        self.render_records()
+                        self.records = []
+                        self.apply_filters()
 
-                    self.after(0, update)
+                    UI_QUEUE.post(update)
                 else:
                     raise requests.RequestException(f"status {response.status_code}")
             except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def delete_selected_error(self, event: tk.Event) -> None:
         item_id = self.tree.focus()
@@ -3788,31 +6440,38 @@ class ErrorsFrame(BaseFrame):
 
         def worker() -> None:
             try:
-                response = requests.delete(
+                response = HttpTransport.delete(
                     f"{API_BASE}/delete_error/{record_id}",
                     headers={"Authorization": f"Bearer {token}"},
                     timeout=10,
                 )
                 if response.status_code == 200:
+                    ERRORS_CACHE.discard(record_id)
+
                     def update() -> None:
                         self.records = [r for r in self.records if r.get("id") != record_id]
-                        self.render_records()
+                        self.apply_filters()
 
-                    self.after(0, update)
+                    UI_QUEUE.post(update)
                 else:
                     raise requests.RequestException(f"status {response.status_code}")
             except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося видалити: {exc}"))
+                UI_QUEUE.post(lambda: messagebox.showerror("Помилка", f"Не вдалося видалити: {exc}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        TASKS.submit(worker, TaskPriority.INTERACTIVE)
 
     def logout(self) -> None:
         self.perform_logout()
 
 
 def main() -> None:
+    if METRICS_PORT is not None:
+        METRICS.serve(METRICS_PORT)
     app = TrackingApp()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        HttpTransport.close()
 
 
 if __name__ == "__main__":  # pragma: no cover